@@ -213,7 +213,8 @@ def experiment_run(ctx, name, runner, group_param, range_param,
     WARNING: The following options are not available for your executable command:\n
     * --runner to specify runner\n
     * --container to specify container\n
-    * --n_threads for local runner, number of threads to use when several groups of parameters.\n
+    * --n_threads for local runner, number of threads to use when several
+      groups of parameters, 0 for one per CPU core.\n
     * --submit_template for htcondor runner, path to the submit template to use or name of the submit template in the config file.\n
     * --wait for htcondor runner, wait for the experiment to finish.\n
     * --param_file to specify a file containing parameters to run as a single run.\n
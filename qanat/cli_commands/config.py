@@ -2,9 +2,9 @@ import yaml
 import subprocess
 import rich
 from rich.prompt import Confirm
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 def command_show():
@@ -11,7 +11,7 @@
 import os
 import rich
 from rich import prompt
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..utils.parsing import parse_dataset_file
 from ..core.database import (
     open_database, add_dataset, find_dataset_id,
@@ -22,7 +22,7 @@ from ._constants import (
     DATASET_TAGS, DATASET_ID)
 from rich.table import Table
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 # --------------------------------------------------------
@@ -26,9 +26,9 @@ from ..core.database import (
         delete_document
 )
 from ..core.documents import DocumentCompiler
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..utils.parsing import parse_document_file
-logger = setup_logger()
+logger = LazyLogger()
 
 
 # ========================================
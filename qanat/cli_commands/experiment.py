@@ -10,6 +10,8 @@
 import os
 import sys
 import time
+import shutil
+import subprocess
 from datetime import datetime
 import rich
 from rich.table import Table
@@ -20,7 +22,7 @@ import rich_click as click
 import sqlalchemy
 import yaml
 from typing import List
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..core.database import (
     open_database, add_experiment, find_experiment_id,
     find_dataset_id, count_number_runs_experiment,
@@ -43,10 +45,11 @@ from ..core.runs import (
     LocalMachineExecutionHandler,
     HTCondorExecutionHandler,
     SlurmExecutionHandler,
+    sacct_batcher,
 )
 from ..core.actions import ActionExecutionHandler
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 # --------------------------------------------------------
@@ -835,6 +838,7 @@ def fetch_status_runs(sessionmaker: sqlalchemy.orm.sessionmaker,
         Session = sessionmaker()
         runs = fetch_runs_of_experiment(Session, experiment_name)
         Session.close()
+        execution_handlers = []
         for run in runs:
             if run.runner == "local":
                 execution_handler = LocalMachineExecutionHandler(
@@ -845,6 +849,22 @@ def fetch_status_runs(sessionmaker: sqlalchemy.orm.sessionmaker,
             elif run.runner == "slurm":
                 execution_handler = SlurmExecutionHandler(
                         sessionmaker, run.id)
+            execution_handlers.append(execution_handler)
+
+        # Query the state of all the Slurm jobs at once
+        slurm_job_ids = [
+                execution_handler.get_pending_job_id()
+                for execution_handler in execution_handlers
+                if isinstance(execution_handler, SlurmExecutionHandler)]
+        slurm_job_ids = [job_id for job_id in slurm_job_ids
+                         if job_id is not None]
+        if len(slurm_job_ids) > 0 and shutil.which('sacct'):
+            try:
+                sacct_batcher.get_states(slurm_job_ids)
+            except subprocess.CalledProcessError as e:
+                logger.error(e)
+
+        for run, execution_handler in zip(runs, execution_handlers):
             try:
                 run.status = execution_handler.check_status()
                 if "100" not in run.progress.strip():
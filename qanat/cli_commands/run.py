@@ -51,7 +51,7 @@ from ..core.runs import (
         parse_executionhandler, RunExecutionHandler,
         LocalMachineExecutionHandler, HTCondorExecutionHandler,
         SlurmExecutionHandler)
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..utils.parsing import (
     parse_args_cli, parse_positional_optional_arguments,
     parse_args_string, parse_yaml_command_file
@@ -59,7 +59,7 @@ from ..utils.parsing import (
 from .experiment import command_action
 from ..utils.misc import walk_directory
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 # ==============================
@@ -923,7 +923,12 @@ def signals_experiment_handler(executionhandler: RunExecutionHandler,
     """
 
     if signum == signal.SIGTERM:
-        executionhandler.cancel_experiment()
+        # The local runner defers the cancel while a command is being
+        # started, so that its process group is killed with the others
+        if isinstance(executionhandler, LocalMachineExecutionHandler):
+            executionhandler.sigint_handler(signum, frame)
+        else:
+            executionhandler.cancel_experiment()
     else:
         raise ValueError(f"Signal {signum} not handled")
 
@@ -1047,6 +1052,13 @@ def launch_run_experiment(experiment_name: str,
     if (ctx is not None) and (param_file is not None):
         parsed_parameters = parse_yaml_command_file(param_file)
 
+    # Checked before creating the run, 0 is one thread per CPU core
+    if runner == 'local' and int(runner_params.get('--n_threads', 1)) < 0:
+        logger.error("The number of threads can't be negative, use 0 for "
+                     "one thread per CPU core.")
+        session.close()
+        return -1
+
     if dry_run:
         logger.info("Dry run: Showing parsed parameters without running the "
                     "experiment.")
@@ -9,14 +9,14 @@
 
 
 from rich.console import Console
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..utils.misc import get_size
 from ..core.database import open_database
 from ._constants import (
         STATUS_DATASET, STATUS_EXPERIMENT, STATUS_RUN,
         STATUS_DISKSIZE, STATUS_RUNNING)
 import yaml
-logger = setup_logger()
+logger = LazyLogger()
 
 
 def command_status():
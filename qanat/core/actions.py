@@ -8,9 +8,9 @@ from .database import (
         get_experiment_of_run, RunOfAnExperiment,
         find_action_id, Action, fetch_groupofparameters_of_run
 )
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 class ActionExecutionHandler:
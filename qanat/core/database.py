@@ -14,7 +14,7 @@ from datetime import datetime
 from dataclasses import dataclass
 from sqlalchemy import (
         Column, Integer, String, ForeignKey, DateTime,
-        create_engine
+        create_engine, update
 )
 from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
@@ -26,8 +26,8 @@ from rich.console import Console
 
 from typing import Tuple, List
 
-from ..utils.logging import setup_logger
-logger = setup_logger()
+from ..utils.logging import LazyLogger
+logger = LazyLogger()
 
 
 # ------------------------------------------------------------
@@ -1108,9 +1108,9 @@ def update_document(session: Session, document_name: str,
     session.commit()
 
 
-def update_run_status(session: Session, run_id: int,
-                      new_status: str) -> None:
-    """Update the status of a run in the database.
+def update_run_progress(session: Session, run_id: int,
+                        new_progress: float) -> None:
+    """Update the progress of a run in the database.
 
     :param session: The session of the database.
     :type session: sqlalchemy.orm.session.Session
@@ -1118,19 +1118,24 @@ def update_run_status(session: Session, run_id: int,
     :param run_id: The id of the run.
     :type run_id: int
 
-    :param new_status: The new status of the run.
-    :type new_status: str
+    :param new_progress: The new progress of the run.
+    :type new_progress: float
     """
-
+    progress_str = "%.2f" % new_progress +\
+                   "%"
     session.query(RunOfAnExperiment).filter(
         RunOfAnExperiment.id == run_id).update(
-        {"status": new_status})
+        {"progress": progress_str})
     session.commit()
 
 
-def update_run_finish_time(session: Session, run_id: int,
-                           new_finish_time: datetime = None) -> None:
-    """Update the finish time of a run in the database.
+def update_run_state(session: Session, run_id: int,
+                     new_status: str = None,
+                     new_start_time: datetime = None,
+                     new_finish_time: datetime = None) -> None:
+    """Update the status, start time and finish time of a run in
+    the database with a single UPDATE. Values left to None are not
+    modified.
 
     :param session: The session of the database.
     :type session: sqlalchemy.orm.session.Session
@@ -1138,58 +1143,27 @@ def update_run_finish_time(session: Session, run_id: int,
     :param run_id: The id of the run.
     :type run_id: int
 
-    :param new_finish_time: The new finish time of the run.
-    :type new_finish_time: datetime.datetime
-    """
-
-    if new_finish_time is None:
-        new_finish_time = datetime.now()
-
-    session.query(RunOfAnExperiment).filter(
-        RunOfAnExperiment.id == run_id).update(
-        {"finished": new_finish_time})
-    session.commit()
-
-
-def update_run_start_time(session: Session, run_id: int,
-                          new_start_time: datetime = None) -> None:
-    """Update the start time of a run in the database.
-
-    :param session: The session of the database.
-    :type session: sqlalchemy.orm.session.Session
-
-    :param run_id: The id of the run.
-    :type run_id: int
+    :param new_status: The new status of the run.
+    :type new_status: str
 
     :param new_start_time: The new start time of the run.
     :type new_start_time: datetime.datetime
+
+    :param new_finish_time: The new finish time of the run.
+    :type new_finish_time: datetime.datetime
     """
-    if new_start_time is None:
+    values = {}
+    if new_status is not None:
+        values["status"] = new_status
+    if new_start_time is not None:
+        values["launched"] = new_start_time
+    if new_finish_time is not None:
+        values["finished"] = new_finish_time
+    if len(values) == 0:
         return
-    session.query(RunOfAnExperiment).filter(
-        RunOfAnExperiment.id == run_id).update(
-        {"launched": new_start_time})
-    session.commit()
-
 
-def update_run_progress(session: Session, run_id: int,
-                        new_progress: float) -> None:
-    """Update the progress of a run in the database.
-
-    :param session: The session of the database.
-    :type session: sqlalchemy.orm.session.Session
-
-    :param run_id: The id of the run.
-    :type run_id: int
-
-    :param new_progress: The new progress of the run.
-    :type new_progress: float
-    """
-    progress_str = "%.2f" % new_progress +\
-                   "%"
-    session.query(RunOfAnExperiment).filter(
-        RunOfAnExperiment.id == run_id).update(
-        {"progress": progress_str})
+    session.execute(update(RunOfAnExperiment).where(
+        RunOfAnExperiment.id == run_id).values(**values))
     session.commit()
 
 
@@ -20,9 +20,9 @@ from .database import (
         RunOfAnExperiment, Experiment, ExperimentResultFiles,
         Document, get_last_run_id
 )
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 def find_run_dependency(runs, file_ids, files, experiment_dependency,
@@ -9,15 +9,22 @@
 
 import git
 import sys
+import copy
+import contextlib
+import json
+import functools
 import shutil
 import time
 import os
 import signal
-from filelock import FileLock
+import select
+import threading
 from sqlalchemy.orm import sessionmaker
 import subprocess
 from datetime import datetime, timedelta
-import psutil
+from collections import Counter
+from concurrent.futures import (
+    ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures)
 import rich
 from rich.progress import (
         Progress, SpinnerColumn, BarColumn, TextColumn
@@ -26,42 +33,103 @@ import yaml
 from .database import (
         get_experiment_of_run, RunOfAnExperiment,
         fetch_groupofparameters_of_run,
-        update_run_status, update_run_finish_time,
-        update_run_start_time, fetch_datasets_of_experiment
+        update_run_state, fetch_datasets_of_experiment
 )
 from .containers import get_container_run_command
-from ..utils.logging import setup_logger
+from ..utils.logging import LazyLogger
 from ..utils.parsing import (
         parse_group_parameters,
         get_absolute_path)
-from ..utils.misc import reverse_readline
-logger = setup_logger()
-
-try:
-    import warnings
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore")
-        import htcondor
-        from htcondor import (
-            JobEventLog,
-            JobEventType
-        )
+from ..utils.misc import reverse_readline, YAMLLoader, YAMLDumper
+logger = LazyLogger()
+
+# The HTCondor bindings are heavy to import, they are only loaded when
+# an HTCondor execution handler is created
+htcondor = None
+
+# Status of a job after each kind of event of its log
+HTCONDOR_EVENT_STATUS = {}
+
+
+@functools.lru_cache(maxsize=None)
+def load_htcondor() -> bool:
+    """Import the HTCondor python bindings, once.
+
+    :return: True if the bindings are available.
+    :rtype: bool
+    """
+    global htcondor
+    try:
+        import warnings
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            import htcondor as bindings
+    except ImportError:
+        if os.path.exists(os.path.join('.qanat/config.yaml')):
+            with open(os.path.join('.qanat/config.yaml'), 'r') as f:
+                config = yaml.load(f, Loader=YAMLLoader)
+            if not config.get('nohtcondorwarning', False):
+                logger.info("HTCondor python bindings not available on "
+                            "system. Please install htcondor if available: "
+                            "pip install htcondor")
+                logger.info("To silence this message, add the following "
+                            "line to your .qanat/config.yml file:")
+                logger.info("nohtcondorwarning: True")
+        return False
+
+    htcondor = bindings
+    HTCONDOR_EVENT_STATUS.update({
+        htcondor.JobEventType.SUBMIT: 'not_started',
+        htcondor.JobEventType.EXECUTE: 'running',
+        htcondor.JobEventType.JOB_TERMINATED: 'finished',
+        htcondor.JobEventType.JOB_HELD: 'held',
+        htcondor.JobEventType.JOB_RELEASED: 'running',
+        htcondor.JobEventType.IMAGE_SIZE: 'running',
+        htcondor.JobEventType.JOB_ABORTED: 'cancelled'
+    })
+    return True
+
+
+# Slurm python bindings talk to slurmctld and slurmdbd directly instead
+# of spawning sbatch, sacct and scancel. They are only loaded when Slurm
+# jobs are submitted, queried or cancelled
+pyslurm = None
+
+
+@functools.lru_cache(maxsize=None)
+def load_pyslurm() -> bool:
+    """Import the Slurm python bindings, once.
+
+    :return: True if the bindings are available.
+    :rtype: bool
+    """
+    global pyslurm
+    try:
+        import pyslurm as bindings
+    except ImportError:
+        return False
+    pyslurm = bindings
+    return True
 
-except ImportError:
 
-    if os.path.exists(os.path.join('.qanat/config.yaml')):
-        with open(os.path.join('.qanat/config.yaml'), 'r') as f:
-            config = yaml.safe_load(f)
-        if not config.get('nohtcondorwarning', False):
-            logger.info("HTCondor python bindings not available on system. "
-                        "Please install htcondor if available: "
-                        "pip install htcondor")
-            logger.info("To silence this message, add the following line "
-                        "to your .qanat/config.yml file:")
-            logger.info("nohtcondorwarning: True")
+WAIT_TIME_INTERVAL_CHECK = 2  # seconds, first and shortest interval
+WAIT_TIME_INTERVAL_MAX = 60  # seconds
+WAIT_TIME_INTERVAL_BACKOFF = 1.5
+CANCEL_GRACE_PERIOD = 5  # seconds
+SACCT_CACHE_TTL = 2  # seconds
+LOG_SCAN_MAX_WORKERS = 32
 
+# Append-only log of the state changes of the commands of a local run
+STATUS_LOG_FILE = 'status.log'
 
-WAIT_TIME_INTERVAL_CHECK = 10  # seconds
+# Status of a run for each HTCondor JobStatus code
+HTCONDOR_JOB_STATUS = {0: 'not_started', 1: 'not_started', 2: 'running',
+                       3: 'cancelled', 4: 'finished', 5: 'held',
+                       6: 'unknown'}
+
+# Parsed info files indexed by path along with the modification time
+# and size of the file at the time of parsing
+_YAML_CACHE = {}
 
 
 def get_progress(repertory_path: str) -> float:
@@ -122,18 +190,418 @@ def get_progress(repertory_path: str) -> float:
     return percent
 
 
+def write_yaml_atomic(path: str, content,
+                      fsync: bool = True) -> os.stat_result:
+    """Write a YAML file through a temporary file renamed over it, so
+    that readers always see either the old or the new complete file.
+
+    :param path: The path of the YAML file.
+    :type path: str
+
+    :param content: The content to dump.
+
+    :param fsync: Whether to flush the file to disk before renaming.
+    :type fsync: bool
+
+    :return: The stat of the written file.
+    :rtype: os.stat_result
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp_path, 'w') as f:
+            yaml.dump(content, f, Dumper=YAMLDumper, sort_keys=False)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+            stat = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return stat
+
+
+def process_alive(pid: int) -> bool:
+    """Check whether a process is alive with a single kill syscall.
+
+    :param pid: The id of the process.
+    :type pid: int
+
+    :return: True if the process exists, even if owned by another user.
+    :rtype: bool
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_group_alive(pgid: int) -> bool:
+    """Check whether a process group still has living members.
+
+    :param pgid: The id of the process group.
+    :type pgid: int
+
+    :return: True if at least one process of the group is alive.
+    :rtype: bool
+    """
+    # Reap the group leader if it is one of our children, otherwise
+    # it stays in the group as a zombie
+    try:
+        os.waitpid(pgid, os.WNOHANG)
+    except ChildProcessError:
+        pass
+
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def terminate_process_groups(pgids: list,
+                             grace_period: float = CANCEL_GRACE_PERIOD):
+    """Send SIGTERM to process groups and SIGKILL to the ones
+    still alive after a grace period.
+
+    :param pgids: The ids of the process groups.
+    :type pgids: list
+
+    :param grace_period: Time in seconds to wait before sending SIGKILL.
+    :type grace_period: float
+    """
+    alive = []
+    for pgid in pgids:
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+            alive.append(pgid)
+        except ProcessLookupError:
+            logger.info(f"Process group {pgid} already killed or finished.")
+
+    deadline = time.monotonic() + grace_period
+    while len(alive) > 0 and time.monotonic() < deadline:
+        time.sleep(0.1)
+        alive = [pgid for pgid in alive if process_group_alive(pgid)]
+
+    for pgid in alive:
+        logger.info(f"Process group {pgid} still alive, sending SIGKILL.")
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_slurm_datetime(value: str) -> datetime:
+    """Parse a date printed by sacct such as 2024-01-31T12:00:00.
+
+    :param value: The date as printed by sacct.
+    :type value: str
+
+    :return: The date or None if unknown (job not started).
+    :rtype: datetime
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_slurm_elapsed(value: str) -> timedelta:
+    """Parse an elapsed time printed by sacct as [D-][HH:]MM:SS.
+
+    :param value: The elapsed time as printed by sacct.
+    :type value: str
+
+    :return: The elapsed time or None if sacct printed something else,
+             such as INVALID.
+    :rtype: timedelta
+    """
+    days, _, clock = value.rpartition('-')
+    try:
+        fields = [int(x) for x in clock.split(':')]
+        days = int(days or 0)
+    except ValueError:
+        return None
+    if len(fields) > 3:
+        return None
+    while len(fields) < 3:
+        fields.insert(0, 0)
+    return timedelta(days=days, hours=fields[0],
+                     minutes=fields[1], seconds=fields[2])
+
+
+def spawn_command(command: list, repertory: str,
+                  working_dir: str) -> subprocess.Popen:
+    """Start a command with its output redirected to stdout.txt and
+    stderr.txt in its repertory.
+
+    The command leads a new session so that cancelling kills its whole
+    process tree. The output files are opened as raw descriptors which
+    are closed in the parent once the child has its own copies.
+
+    The descriptors opened by Python are not inheritable, so the child
+    does not need to close them one by one (a walk of /proc/self/fd
+    before Python 3.10).
+
+    :param command: The command to run.
+    :type command: list
+
+    :param repertory: The repertory for the output files.
+    :type repertory: str
+
+    :param working_dir: The directory to run the command from.
+    :type working_dir: str
+
+    :return: The started process.
+    :rtype: subprocess.Popen
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    stdout_fd = os.open(os.path.join(repertory, 'stdout.txt'), flags, 0o644)
+    try:
+        stderr_fd = os.open(os.path.join(repertory, 'stderr.txt'),
+                            flags, 0o644)
+        try:
+            return subprocess.Popen(command, stdout=stdout_fd,
+                                    stderr=stderr_fd, cwd=working_dir,
+                                    start_new_session=True,
+                                    close_fds=False)
+        finally:
+            os.close(stderr_fd)
+    finally:
+        os.close(stdout_fd)
+
+
+def run_processes(spawn, count: int, max_running: int):
+    """Run subprocesses with at most max_running of them alive at the
+    same time, yielding each one as soon as it exits.
+
+    The next process is started as soon as one exits instead of waiting
+    for a whole batch. Exits are watched by the kernel: with pidfds
+    registered in an epoll set on Linux 5.3+ (Python 3.9+), or with
+    process exit filters of a kqueue on macOS and BSD. Otherwise each
+    process is waited for in its own thread.
+
+    :param spawn: Function starting the process of the given index.
+    :type spawn: callable
+
+    :param count: Number of processes to run.
+    :type count: int
+
+    :param max_running: Maximum number of processes alive at once.
+    :type max_running: int
+
+    :return: The index and the process, for each exited process.
+    :rtype: generator of tuple
+    """
+    processes = {}
+    next_index = 0
+    epoll = None
+    kqueue = None
+    if hasattr(os, 'pidfd_open') and hasattr(select, 'epoll'):
+        epoll = select.epoll()
+    elif hasattr(select, 'kqueue'):
+        kqueue = select.kqueue()
+    pidfds = {}
+    futures = {}
+    executor = None
+    try:
+        while next_index < count or len(processes) > 0:
+            exited = []
+            while next_index < count and len(processes) < max_running:
+                process = spawn(next_index)
+                processes[next_index] = process
+                if epoll is not None:
+                    try:
+                        fd = os.pidfd_open(process.pid)
+                    except OSError:
+                        # pidfds not available: only this process is
+                        # watched at this point
+                        if len(pidfds) > 0:
+                            raise
+                        epoll.close()
+                        epoll = None
+                    else:
+                        pidfds[fd] = next_index
+                        epoll.register(fd, select.EPOLLIN)
+                elif kqueue is not None:
+                    event = select.kevent(
+                            process.pid, filter=select.KQ_FILTER_PROC,
+                            flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                            fflags=select.KQ_NOTE_EXIT, udata=next_index)
+                    try:
+                        kqueue.control([event], 0)
+                    except ProcessLookupError:
+                        # Already exited and reaped
+                        exited.append(next_index)
+                if epoll is None and kqueue is None:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(
+                                max_workers=max_running)
+                    futures[executor.submit(process.wait)] = next_index
+                next_index += 1
+
+            # Processes found already exited are yielded without waiting
+            if len(exited) == 0 and epoll is not None:
+                for fd, _ in epoll.poll():
+                    exited.append(pidfds.pop(fd))
+                    epoll.unregister(fd)
+                    os.close(fd)
+            elif len(exited) == 0 and kqueue is not None:
+                exited = [event.udata for event in
+                          kqueue.control(None, max_running)]
+            elif len(exited) == 0:
+                done, _ = wait_futures(futures, return_when=FIRST_COMPLETED)
+                exited = [futures.pop(future) for future in done]
+
+            for i in exited:
+                process = processes.pop(i)
+                process.wait()
+                yield i, process
+    finally:
+        for fd in pidfds:
+            os.close(fd)
+        if epoll is not None:
+            epoll.close()
+        if kqueue is not None:
+            kqueue.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+class SacctBatcher:
+    """Query the state of Slurm jobs with sacct.
+
+    The states of several jobs are fetched with a single call to sacct
+    and kept for SACCT_CACHE_TTL seconds, so that checking the status
+    of many runs does not fork one sacct per run.
+    """
+
+    def __init__(self, ttl: float = SACCT_CACHE_TTL):
+        self.ttl = ttl
+        self._states = {}
+
+    def get_states(self, job_ids: list) -> dict:
+        """Get the state of the tasks of Slurm jobs.
+
+        :param job_ids: The ids of the jobs.
+        :type job_ids: list
+
+        :return: For each job id, the list of (state, start, elapsed)
+                 of its tasks.
+        :rtype: dict
+
+        :raises subprocess.CalledProcessError: If sacct fails.
+        """
+        now = time.monotonic()
+        stale = [job_id for job_id in job_ids
+                 if job_id not in self._states or
+                 now - self._states[job_id][0] > self.ttl]
+
+        if len(stale) > 0:
+            if load_pyslurm():
+                tasks = self.load_tasks_pyslurm(stale)
+            else:
+                tasks = self.load_tasks_sacct(stale)
+
+            for job_id, job_tasks in tasks.items():
+                self._states[job_id] = (now, job_tasks)
+
+        return {job_id: self._states[job_id][1] for job_id in job_ids}
+
+    def load_tasks_sacct(self, job_ids: list) -> dict:
+        """Get the tasks of Slurm jobs with a single sacct call.
+
+        :param job_ids: The ids of the jobs.
+        :type job_ids: list
+
+        :return: For each job id, the list of (state, start, elapsed)
+                 of its tasks.
+        :rtype: dict
+
+        :raises subprocess.CalledProcessError: If sacct fails.
+        """
+        output = subprocess.check_output(
+                ['sacct', '-X', '-P', '--noheader',
+                 '-j', ','.join(job_ids),
+                 '--format=JobID,Start,State,Elapsed'])
+
+        tasks = {job_id: [] for job_id in job_ids}
+        for line in output.decode('utf-8').splitlines():
+            fields = line.split('|')
+            if len(fields) != 4:
+                continue
+            # Array tasks are reported as <job_id>_<task_id>
+            job_id = fields[0].split('_')[0]
+            if job_id in tasks:
+                tasks[job_id].append((fields[2], fields[1], fields[3]))
+        return tasks
+
+    def load_tasks_pyslurm(self, job_ids: list) -> dict:
+        """Get the tasks of Slurm jobs from slurmdbd with pyslurm.
+
+        States, start and elapsed times are formatted as sacct would
+        print them.
+
+        :param job_ids: The ids of the jobs.
+        :type job_ids: list
+
+        :return: For each job id, the list of (state, start, elapsed)
+                 of its tasks.
+        :rtype: dict
+
+        :raises subprocess.CalledProcessError: If slurmdbd can't be
+                                               queried.
+        """
+        try:
+            jobs = pyslurm.db.Jobs.load(pyslurm.db.JobFilter(
+                ids=[int(job_id) for job_id in job_ids]))
+        except pyslurm.RPCError as e:
+            raise subprocess.CalledProcessError(1, 'pyslurm.db.Jobs.load',
+                                                str(e))
+
+        tasks = {job_id: [] for job_id in job_ids}
+        for job in jobs.values():
+            # Array tasks have the id of their array job as array_id
+            job_id = str(job.array_id or job.id)
+            if job_id not in tasks:
+                continue
+            if job.start_time:
+                start = datetime.fromtimestamp(job.start_time).strftime(
+                        '%Y-%m-%dT%H:%M:%S')
+            else:
+                start = 'Unknown'
+            minutes, seconds = divmod(job.elapsed_time or 0, 60)
+            hours, minutes = divmod(minutes, 60)
+            days, hours = divmod(hours, 24)
+            elapsed = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            if days > 0:
+                elapsed = f"{days}-{elapsed}"
+            tasks[job_id].append((job.state, start, elapsed))
+        return tasks
+
+
+sacct_batcher = SacctBatcher()
+
+
 def parse_executionhandler(executionhandler: str):
     """Parse the execution handler from a string.
 
     :param executionhandler: The execution handler as a string.
     :type executionhandler: str
+
+    :return: The class of the execution handler.
+    :rtype: type
     """
 
-    if executionhandler == 'local':
-        return LocalMachineExecutionHandler
-    elif executionhandler == 'htcondor':
-        return HTCondorExecutionHandler
-    else:
+    try:
+        return EXECUTION_HANDLERS[executionhandler]
+    except KeyError:
         raise ValueError(f"Unknown execution handler {executionhandler}")
 
 
@@ -155,18 +623,24 @@ class RunExecutionHandler:
         self.session_maker = database_sessionmaker
         self.run_id = run_id
         self.commit_sha = commit_sha
-        self.experiment = get_experiment_of_run(self.session_maker(),
-                                                run_id)
         self.container_path = container_path
         self.gpu = gpu
-        Session = self.session_maker()
-        self.run = Session.query(
-                RunOfAnExperiment).get(run_id)
-        Session.close()
+
+        # Both objects stay usable once the session is closed since
+        # only their columns are accessed
+        with self.session_maker() as Session:
+            self.experiment = get_experiment_of_run(Session, run_id)
+            self.run = Session.get(RunOfAnExperiment, run_id)
+
+        # Last values of the run known to be in the database
+        self.persisted_state = {'status': self.run.status,
+                                'launched': self.run.launched,
+                                'finished': self.run.finished}
 
         #  Transfrom run storage_path to absolute path
         self.relative_storage_path = self.run.storage_path
         self.run.storage_path = get_absolute_path(self.run.storage_path)
+        self.info_path = os.path.join(self.run.storage_path, 'info.yaml')
         self.working_dir = os.getcwd()
 
     def setup_specific_commit_run(self):
@@ -183,8 +657,7 @@ class RunExecutionHandler:
         cache_path = os.path.join(os.getcwd(), '.qanat', 'cache')
         logger.info(f"Setting up specific commit {self.commit_sha}"
                     f"in {cache_path}")
-        if not os.path.exists(cache_path):
-            os.makedirs(cache_path)
+        os.makedirs(cache_path, exist_ok=True)
         repo_cwd = git.Repo(os.getcwd())
         repo_path = os.path.join(cache_path, self.commit_sha)
         if not os.path.exists(repo_path):
@@ -201,18 +674,19 @@ class RunExecutionHandler:
         # If we need to run a specific commit
         self.setup_specific_commit_run()
 
-        # Fetch parameters of the run
-        Session = self.session_maker()
-        groups_of_parameters = fetch_groupofparameters_of_run(
-                Session, self.run_id)
+        # Fetch parameters of the run and datasets of the experiment
+        with self.session_maker() as Session:
+            groups_of_parameters = fetch_groupofparameters_of_run(
+                    Session, self.run_id)
+            self.datasets = fetch_datasets_of_experiment(
+                    Session, self.experiment.name)
 
         # Constructing directory structure depending on the
         # number of groups of parameters
         if len(groups_of_parameters) == 1:
             logger.info("Single group of parameters detected")
             logger.info(f"Creating {self.run.storage_path}")
-            if not os.path.exists(self.run.storage_path):
-                os.makedirs(self.run.storage_path)
+            os.makedirs(self.run.storage_path, exist_ok=True)
             self.repertories = [self.run.storage_path]
             self.relative_repertories = [self.relative_storage_path]
         else:
@@ -220,36 +694,36 @@ class RunExecutionHandler:
                         f" {len(groups_of_parameters)}")
             logger.info(f"Creating {len(groups_of_parameters)} repertories "
                         f"in {self.run.storage_path}")
-            if not os.path.exists(self.run.storage_path):
-                os.makedirs(self.run.storage_path)
-
-            self.repertories = []
-            self.relative_repertories = []
-            for i in range(len(groups_of_parameters)):
-                path = os.path.join(self.run.storage_path,
-                                    'group_'+str(i))
-                if not os.path.exists(path):
-                    os.makedirs(path)
-                self.relative_repertories.append(os.path.join(
-                    self.relative_storage_path, 'group_'+str(i))
-                )
-                self.repertories.append(path)
+            os.makedirs(self.run.storage_path, exist_ok=True)
+
+            self.repertories = [
+                os.path.join(self.run.storage_path, f'group_{i}')
+                for i in range(len(groups_of_parameters))]
+            self.relative_repertories = [
+                os.path.join(self.relative_storage_path, f'group_{i}')
+                for i in range(len(groups_of_parameters))]
+
+            # The parent exists, only the missing groups are created
+            with os.scandir(self.run.storage_path) as entries:
+                existing = set(entry.name for entry in entries)
+            for i, path in enumerate(self.repertories):
+                if f'group_{i}' not in existing:
+                    os.mkdir(path)
 
         # Constructing the commands to run
         self.groups_of_parameters = [parameters.values for
-                                     parameters in
-                                     fetch_groupofparameters_of_run(
-                                         Session, self.run_id)]
+                                     parameters in groups_of_parameters]
         # Copying parameter files
         self.copy_parameter_files()
 
-        self.commands = []
-        for i, group_of_parameters in enumerate(self.groups_of_parameters):
-            command = [self.experiment.executable_command,
-                       self.experiment.executable]
-            command += parse_group_parameters(group_of_parameters)
-            command += ['--storage_path', self.repertories[i]]
-            self.commands.append(command)
+        executable_command = self.experiment.executable_command
+        executable = self.experiment.executable
+        self.commands = [
+            [executable_command, executable,
+             *parse_group_parameters(group_of_parameters),
+             '--storage_path', repertory]
+            for group_of_parameters, repertory in zip(
+                self.groups_of_parameters, self.repertories)]
 
         # Managing container execution
         if self.container_path is not None:
@@ -262,12 +736,7 @@ class RunExecutionHandler:
                 }
 
                 # Get datasets paths to bind as well
-                Session = self.session_maker()
-                datasets = fetch_datasets_of_experiment(
-                        Session, self.experiment.name)
-                Session.close()
-
-                for dataset in datasets:
+                for dataset in self.datasets:
                     absolute_path = get_absolute_path(dataset.path)
                     bind_paths[absolute_path] = absolute_path
 
@@ -302,10 +771,7 @@ class RunExecutionHandler:
         else:
             info['commit_sha'] = git.Repo(os.getcwd()).head.commit.hexsha
 
-        with open(os.path.join(self.run.storage_path,
-                               'info.yaml'), 'w') as f:
-            yaml.dump(info, f)
-        Session.close()
+        self.update_yaml_file(info)
 
     def copy_parameter_files(self):
         """If there are parameters files in the arguments,
@@ -320,13 +786,12 @@ class RunExecutionHandler:
                 else:
                     parameters_files = group_of_parameters["--parameters_file"]
 
+                # Created once for all the files of the group
+                param_file_dir = os.path.join(repertory, 'parameters_files')
+                os.makedirs(param_file_dir, exist_ok=True)
                 for file in parameters_files:
                     try:
                         logger.info(f"Copying parameter file {file}")
-                        param_file_dir = os.path.join(
-                            repertory, 'parameters_files')
-                        if not os.path.exists(param_file_dir):
-                            os.makedirs(param_file_dir)
                         shutil.copy(file, param_file_dir)
                     except FileNotFoundError:
                         logger.error(f"Parameter file File {file} not found")
@@ -334,14 +799,13 @@ class RunExecutionHandler:
     def add_datasets_to_commands(self):
         """Add dataset paths to commands"""
 
-        Session = self.session_maker()
-        datasets = fetch_datasets_of_experiment(
-                Session, self.experiment.name)
-        Session.close()
+        dataset_arguments = []
+        for dataset in self.datasets:
+            dataset_arguments += ['--dataset_path',
+                                  get_absolute_path(dataset.path)]
 
-        for command, repertory in zip(self.commands, self.repertories):
-            for dataset in datasets:
-                command += ['--dataset_path', get_absolute_path(dataset.path)]
+        for command in self.commands:
+            command += dataset_arguments
 
     def write_groups_info(self):
         """Write group information in the repertory"""
@@ -350,19 +814,28 @@ class RunExecutionHandler:
                 self.commands, self.groups_of_parameters, self.repertories):
             group_info = {'command': " ".join([str(c) for c in command]),
                           'parameters': group_of_parameters}
-            with open(os.path.join(repertory, 'group_info.yaml'), 'w') as f:
-                yaml.dump(group_info, f)
+            write_yaml_atomic(os.path.join(repertory, 'group_info.yaml'),
+                              group_info, fsync=False)
 
     def parse_yaml_file(self) -> dict:
         """Parse YAML info file
 
         :return dict: The info dictionary
         """
+        path = self.info_path
         try:
-            with open(os.path.join(self.run.storage_path,
-                                   'info.yaml'), 'r') as f:
-                info = yaml.load(f, Loader=yaml.FullLoader)
-            return info
+            # Reuse the parsed content if the file did not change
+            stat = os.stat(path)
+            cached = _YAML_CACHE.get(path)
+            if cached is not None and \
+                    cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return copy.deepcopy(cached[2])
+
+            with open(path, 'r') as f:
+                stat = os.fstat(f.fileno())
+                info = yaml.load(f, Loader=YAMLLoader)
+            _YAML_CACHE[path] = (stat.st_mtime_ns, stat.st_size, info)
+            return copy.deepcopy(info)
 
         except FileNotFoundError:
             logger.error(f"No info.yaml file found for run {self.run.id}.")
@@ -379,9 +852,57 @@ class RunExecutionHandler:
 
         :param dict info: The info dictionary
         """
-        with open(os.path.join(self.run.storage_path,
-                               'info.yaml'), 'w') as f:
-            yaml.dump(info, f)
+        path = self.info_path
+
+        # Nothing to write if the file on disk already holds this info
+        cached = _YAML_CACHE.pop(path, None)
+        if cached is not None and cached[2] == info:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and \
+                    cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                _YAML_CACHE[path] = cached
+                return
+
+        stat = write_yaml_atomic(path, info)
+
+        # Keep what was written so that the next parse doesn't have to
+        # read the file back
+        _YAML_CACHE[path] = (stat.st_mtime_ns, stat.st_size,
+                             copy.deepcopy(info))
+
+    def persist_run_state(self, status: str = None,
+                          start_time: datetime = None,
+                          finish_time: datetime = None):
+        """Write the status, start time and finish time of the run
+        in the database. Only the values that differ from the last
+        known ones are written, with a single UPDATE.
+
+        :param status: The status of the run.
+        :type status: str
+
+        :param start_time: The start time of the run.
+        :type start_time: datetime.datetime
+
+        :param finish_time: The finish time of the run.
+        :type finish_time: datetime.datetime
+        """
+        changed = {key: value for key, value in [
+                        ('status', status), ('launched', start_time),
+                        ('finished', finish_time)]
+                   if value is not None and
+                   self.persisted_state[key] != value}
+        if len(changed) == 0:
+            return
+
+        with self.session_maker() as Session:
+            update_run_state(Session, self.run_id,
+                             changed.get('status'),
+                             changed.get('launched'),
+                             changed.get('finished'))
+        self.persisted_state.update(changed)
 
     def check_progress(self) -> float:
         """Check the progress of the run.
@@ -443,19 +964,130 @@ class LocalMachineExecutionHandler(RunExecutionHandler):
                  run_id: int, n_threads: int = 1, container_path: str = None,
                  commit_sha: str = None,
                  only_check_status: bool = False, gpu: bool = False):
+        if n_threads < 0:
+            raise ValueError(f"Number of threads {n_threads} is negative.")
         super().__init__(database_sessionmaker, run_id, container_path,
                          commit_sha, gpu)
+
+        # 0 threads means as many threads as CPU cores
+        if n_threads == 0:
+            n_threads = os.cpu_count() or 1
         self.n_threads = n_threads
         self.process_pid = os.getpid()
         if not only_check_status:
             signal.signal(signal.SIGINT, self.sigint_handler)
+            # Commands lead their own session and do not get the hangup
+            # of the terminal, the run is cancelled as on a SIGINT
+            signal.signal(signal.SIGHUP, self.sigint_handler)
         self.console = rich.console.Console()
         self.progress = None
+        self.status_log_fd = None
+
+        # A SIGINT received while a command is being started is handled
+        # once its process group is logged
+        self.starting_command = False
+        self.cancel_requested = False
 
     def sigint_handler(self, signum, frame):
-        """Handle the SIGINT signal."""
+        """Handle the SIGINT, SIGHUP and SIGTERM signals."""
+        if self.starting_command:
+            self.cancel_requested = True
+            return
         self.cancel_experiment()
 
+    def start_command(self, index: int, **values) -> subprocess.Popen:
+        """Start a command and log it as running.
+
+        A cancel requested in between is deferred until the process
+        group of the command is in the status log, so that it is
+        killed with the others.
+
+        :param index: Index of the command to start.
+        :type index: int
+
+        :param values: Other info values to log with the command.
+
+        :return: The started process.
+        :rtype: subprocess.Popen
+        """
+        command = [str(c) for c in self.commands[index]]
+        self.starting_command = True
+        try:
+            process = spawn_command(command, self.repertories[index],
+                                    self.working_dir)
+            # Session leader: its process group id is its pid
+            self.log_status_event(index, status='running',
+                                  pids=str(process.pid),
+                                  pgids=str(process.pid), **values)
+        finally:
+            self.starting_command = False
+        if self.cancel_requested:
+            self.cancel_experiment()
+        return process
+
+    def parse_yaml_file(self) -> dict:
+        """Parse YAML info file and apply the state changes of the
+        commands logged since it was written.
+
+        :return dict: The info dictionary
+        """
+        info = super().parse_yaml_file()
+        if info is None:
+            return None
+
+        path = os.path.join(self.run.storage_path, STATUS_LOG_FILE)
+        offset = info.get('status_log_offset', 0)
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return info
+
+        # Ignore a line still being written
+        data = data[:data.rfind(b'\n') + 1]
+        for line in data.splitlines():
+            event = json.loads(line)
+            index = event.pop('i', None)
+            for key, value in event.items():
+                if key in ['start_time', 'end_time']:
+                    value = datetime.fromisoformat(value)
+                if index is None:
+                    info[key] = value
+                    continue
+                values = info.get(key)
+                if not isinstance(values, list):
+                    values = []
+                values += ['' for _ in range(index + 1 - len(values))]
+                values[index] = value
+                info[key] = values
+        info['status_log_offset'] = offset + len(data)
+        return info
+
+    def log_status_event(self, index: int = None, **values):
+        """Append a state change to the status log of the run.
+
+        :param index: Index of the command the values are about. If
+                      None, the values are about the whole run.
+        :type index: int
+
+        :param values: The info values to set.
+        """
+        if index is not None:
+            values['i'] = index
+        for key in ['start_time', 'end_time']:
+            if key in values:
+                values[key] = values[key].isoformat()
+        line = json.dumps(values) + "\n"
+
+        # A single write on a file opened in append mode is not
+        # interleaved with the other writes
+        if self.status_log_fd is None:
+            self.status_log_fd = os.open(
+                    os.path.join(self.run.storage_path, STATUS_LOG_FILE),
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(self.status_log_fd, line.encode('utf-8'))
+
     def run_experiment(self):
         """Launch the execution of the run as subprocesses.
         To run after calling setUp().
@@ -467,114 +1099,61 @@ class LocalMachineExecutionHandler(RunExecutionHandler):
         info['main_pid'] = self.process_pid
         self.update_yaml_file(info)
 
-        Session = self.session_maker()
-        Session.query(RunOfAnExperiment).filter(
-                RunOfAnExperiment.id == self.run_id).update(
-                {'launched': launched_time})
         if self.n_threads > 1:
             logger.info(
                     f"Running {len(self.commands)} executions in parallel:"
-                    f" {max(self.n_threads, len(self.commands))} threads")
+                    f" {min(self.n_threads, len(self.commands))} threads")
             logger.info("The output of the executions will be "
                         f"redirected to {self.run.storage_path}")
             logger.warning('Do not interrupt the program or the '
                            'executions will be interrupted')
 
-            # Print list of commands
-            rich.print('[bold]List of commands to run:[/bold]')
-            for command in self.commands:
-                command = [str(c) for c in command]
-                rich.print('- [bold]'+' '.join(command)+'[/bold]')
-
-            processes = []
-            pids = []
-            status_list = []
-
-            with self.console.status(
-                    "[bold green]Running...", spinner='dots'):
-                stdout_list = []
-                stderr_list = []
-
-                # Creating sequence of commands to runs at
-                # different times
-                commands_sequences = []
-                command_one_sequence = []
-                repertories_sequences = []
-                repertories_one_sequence = []
-                i_start = 0
-                for i, command in enumerate(self.commands):
-                    command_one_sequence.append(command)
-                    repertories_one_sequence.append(self.repertories[i])
-                    if (i+1) % self.n_threads == 0 or \
-                        (i == len(self.commands)-1 and
-                         (len(self.commands)-i_start) <= self.n_threads):
-                        commands_sequences.append(command_one_sequence)
-                        repertories_sequences.append(repertories_one_sequence)
-                        command_one_sequence = []
-                        repertories_one_sequence = []
-                        i_start = i+1
-
-                for i, (command_sequence, repertory_sequence) in \
-                        enumerate(zip(
-                            commands_sequences, repertories_sequences)):
-
-                    logger.info(f"Running {i+1}/{len(commands_sequences)} "
-                                "sequence of commands:")
-                    for command in command_sequence:
-                        command_str = " ".join([str(c) for c in command])
-                        logger.info(f"- {command_str}")
-
-                    for command, repertory in zip(command_sequence,
-                                                  repertory_sequence):
-                        command = [str(c) for c in command]
-                        stdout_file = open(os.path.join(repertory,
-                                                        'stdout.txt'), 'w')
-                        stderr_file = open(os.path.join(repertory,
-                                                        'stderr.txt'), 'w')
-                        stdout_list.append(stdout_file)
-                        stderr_list.append(stderr_file)
-
-                        process = subprocess.Popen(command,
-                                                   stdout=stdout_file,
-                                                   stderr=stderr_file,
-                                                   cwd=self.working_dir)
-                        pids.append(str(process.pid))
-                        processes.append(process)
-                        status_list.append('running')
-
-                    if self.run.status != 'running':
-                        self.run.status = 'running'
-                        update_run_status(Session, self.run_id,
-                                          "running")
-                    Session.close()
-
-                    # Add info in the yaml file
-                    info = self.parse_yaml_file()
-                    info['pids'] = pids
-                    if 'start_time' not in info:
-                        info['start_time'] = datetime.now()
-                    info['status'] = status_list
-                    self.update_yaml_file(info)
-
-                    for i, process in enumerate(processes):
-                        process.wait()
-                        if process.returncode != 0:
-                            status_list[i] = 'error'
-                        else:
-                            status_list[i] = 'finished'
-                        stdout_list[i].close()
-                        stderr_list[i].close()
-
-            # Add info in the yaml file
+            # Print list of commands, in a single render
+            rich.print('[bold]List of commands to run:[/bold]\n' + '\n'.join(
+                '- [bold]' + ' '.join([str(c) for c in command]) + '[/bold]'
+                for command in self.commands))
+
+            status_list = ['not_started' for _ in self.commands]
+
+            # Every command is listed before the first one starts, so
+            # that the run is not seen as finished while commands are
+            # still waiting for a thread
             info = self.parse_yaml_file()
-            info['end_time'] = datetime.now()
-            info['status'] = status_list
+            info['status'] = list(status_list)
+            info['pids'] = ['' for _ in self.commands]
+            info['pgids'] = ['' for _ in self.commands]
             self.update_yaml_file(info)
 
-            Session = self.session_maker()
-            update_run_status(Session, self.run_id,
-                              "finished")
-            Session.close()
+            # No spinner redrawn in the background when the output is
+            # not a terminal
+            running_status = None
+            if self.console.is_terminal:
+                running_status = self.console.status(
+                        "[bold green]Running...", spinner='dots')
+            with running_status or contextlib.nullcontext():
+
+                self.persist_run_state(status='running',
+                                       start_time=launched_time)
+                self.log_status_event(start_time=datetime.now())
+
+                # A new command is started as soon as one finishes so
+                # that n_threads commands are always running
+                n_done = 0
+                for i, process in run_processes(
+                        self.start_command, len(self.commands),
+                        self.n_threads):
+                    if process.returncode != 0:
+                        status_list[i] = 'error'
+                    else:
+                        status_list[i] = 'finished'
+                    self.log_status_event(i, status=status_list[i])
+
+                    # Only the spinner text changes, nothing is printed
+                    n_done += 1
+                    if running_status is not None:
+                        running_status.update(
+                                f"[bold green]Running... {n_done}/"
+                                f"{len(self.commands)} done")
 
         else:
             logger.info(
@@ -582,121 +1161,118 @@ class LocalMachineExecutionHandler(RunExecutionHandler):
             logger.info("The output of the executions will be "
                         f"redirected to {self.run.storage_path}")
 
-            update_run_status(Session, self.run_id,
-                              "running")
-            Session.close()
+            self.persist_run_state(status='running',
+                                   start_time=launched_time)
 
             status_list = ['not_started' for _ in self.commands]
             pid_list = ['' for _ in self.commands]
+            pgid_list = ['' for _ in self.commands]
             start_time_list = ['' for _ in self.commands]
             end_time_list = ['' for _ in self.commands]
 
+            # Written once, the state changes of the commands are then
+            # appended to the status log
+            info = self.parse_yaml_file()
+            info['start_time'] = start_time_list
+            info['end_time'] = end_time_list
+            info['status'] = status_list
+            info['pids'] = pid_list
+            info['pgids'] = pgid_list
+            self.update_yaml_file(info)
+
+            # Only redrawn when a command finishes, there is nothing else
+            # to show between two commands
             self.progress = Progress(
                  SpinnerColumn(),
                  TextColumn("[bold blue]{task.description}"),
                  BarColumn(bar_width=None),
-                 "[progress.percentage]{task.percentage:>3.0f}%")
+                 "[progress.percentage]{task.percentage:>3.0f}%",
+                 auto_refresh=False)
+            logger.warning("Do not close the terminal window. "
+                           "It will cancel the execution of the run.")
             with self.progress as progress:
                 task = progress.add_task("Running..", total=len(self.commands))
                 for i, command in enumerate(self.commands):
-                    command_str = " ".join([str(x) for x in command])
-                    logger.info(f"Running '{command_str}'")
-                    logger.warning("Do not close the terminal window. "
-                                   "It will cancel the execution of the run.")
-
-                    # Redirect stdout and stderr of the subprocess
-                    # to a file
-                    stdout_file = os.path.join(self.repertories[i],
-                                               'stdout.txt')
-                    stderr_file = os.path.join(self.repertories[i],
-                                               'stderr.txt')
-                    stdout = open(stdout_file, 'w')
-                    stderr = open(stderr_file, 'w')
                     command = [str(x) for x in command]
-                    process = subprocess.Popen(command, stdout=stdout,
-                                               stderr=stderr,
-                                               cwd=self.working_dir)
+                    logger.info(f"Running '{' '.join(command)}'")
 
-                    pid = process.pid
-                    status_list[i] = 'running'
-                    pid_list[i] = str(pid)
                     start_time_list[i] = datetime.now()
-                    # Add info in the yaml file
-                    info = self.parse_yaml_file()
-                    info['start_time'] = start_time_list
-                    info['status'] = status_list
-                    info['pids'] = pid_list
-                    self.update_yaml_file(info)
+                    process = self.start_command(
+                            i, start_time=start_time_list[i])
+                    status_list[i] = 'running'
 
                     # Wait for the process to finish
                     process.wait()
 
-                    # Close the files
-                    stdout.close()
-                    stderr.close()
-
                     # Command finished
                     status_list[i] = 'finished'
                     end_time_list[i] = datetime.now()
                     logger.info(f"Finished {command}\n")
 
-                    # Add info in the yaml file
-                    info = self.parse_yaml_file()
-                    info['end_time'] = end_time_list
-                    info['status'] = status_list
-                    self.update_yaml_file(info)
+                    self.log_status_event(i, status='finished',
+                                          end_time=end_time_list[i])
 
                     progress.update(task, advance=1)
+                    progress.refresh()
+
+        if self.status_log_fd is not None:
+            os.close(self.status_log_fd)
+            self.status_log_fd = None
+
+        # Fold the status log in the yaml file
+        finish_time = datetime.now()
+        info = self.parse_yaml_file()
+        if self.n_threads > 1:
+            info['end_time'] = finish_time
+        self.update_yaml_file(info)
 
         logger.info("Updating database with finished time")
-        Session = self.session_maker()
-        update_run_status(Session, self.run_id,
-                          "finished")
-        update_run_finish_time(Session, self.run_id)
-        Session.close()
+        self.persist_run_state(status="finished", finish_time=finish_time)
 
     def cancel_experiment(self):
         """Cancel the run."""
 
         # Check if run is running
-        if self.check_status() != "running":
+        status = self.check_status()
+        if status in ["finished", "cancelled"]:
+            logger.info(f"Run is {status}. Nothing to cancel.")
+        elif status != "running":
             logger.info("Run is not running. Nothing to cancel.")
-        elif self.check_status() == "finished" or \
-                self.check_status() == "cancelled":
-            logger.info(f"Run is {self.check_status()}. Nothing to cancel.")
 
         # Get the pids of the processes
         try:
-            with open(os.path.join(self.run.storage_path,
-                                   'info.yaml'), 'r') as f:
-                info = yaml.load(f, Loader=yaml.FullLoader)
+            info = self.parse_yaml_file()
+            if info is None:
+                raise FileNotFoundError
             pids = info['pids']
 
             # Kill the processes
-            logger.info("Killing the processes: "
-                        f"{', '.join(pids)}")
-            for pid in pids:
-                try:
-                    if pid != '':
-                        os.kill(int(pid), signal.SIGTERM)
-                except ProcessLookupError:
-                    logger.info(f"Process {pid} already killed or finished.")
+            if 'pgids' in info:
+                # Every command runs in its own process group, killing
+                # the group also kills the processes it spawned
+                pgids = [pgid for pgid in info['pgids'] if pgid != '']
+                logger.info("Killing the process groups: "
+                            f"{', '.join(pgids)}")
+                terminate_process_groups([int(pgid) for pgid in pgids])
+            else:
+                logger.info("Killing the processes: "
+                            f"{', '.join(pids)}")
+                for pid in pids:
+                    try:
+                        if pid != '':
+                            os.kill(int(pid), signal.SIGTERM)
+                    except ProcessLookupError:
+                        logger.info(
+                            f"Process {pid} already killed or finished.")
             logger.info("Processes killed.")
 
             # Update the status of the run
-            Session = self.session_maker()
-            update_run_status(Session, self.run_id,
-                              "cancelled")
+            self.persist_run_state(status="cancelled")
 
             # Update the YAML file
             info['status'] = ['cancelled' for _ in info['pids']]
             info['end_time'] = datetime.now()
-            with open(os.path.join(self.run.storage_path,
-                                   'info.yaml'), 'w') as f:
-                yaml.dump(info, f)
-
-            # Close the session
-            Session.close()
+            self.update_yaml_file(info)
 
             logger.info("Run cancelled.")
 
@@ -710,31 +1286,20 @@ class LocalMachineExecutionHandler(RunExecutionHandler):
     def check_status(self):
         """Check the status of the run."""
 
-        status = "unknown"
-        Session = self.session_maker()
-        # Check if run in database is marked as finished or cancelled
-        if Session.query(
-                RunOfAnExperiment).filter_by(id=self.run_id).first().status \
-                == "finished":
-            status = "finished"
-        elif Session.query(
-                RunOfAnExperiment).filter_by(id=self.run_id).first().status \
-                == "cancelled":
-            status = "cancelled"
-
-        Session.close()
-        if status != "unknown":
+        # The database answers for runs that are over or not launched
+        with self.session_maker() as Session:
+            status = Session.get(RunOfAnExperiment, self.run_id).status
+        if status in ["finished", "cancelled"]:
             return status
+        if status == "Not started":
+            return "not_started"
 
         # Otherwhise we need more checks
         # Check if yaml file exists
-        if not os.path.exists(os.path.join(self.run.storage_path,
-                                           'info.yaml')):
+        if not os.path.exists(self.info_path):
             return "not_started"
 
-        with open(os.path.join(self.run.storage_path,
-                               'info.yaml'), 'r') as f:
-            info = yaml.load(f, Loader=yaml.FullLoader)
+        info = self.parse_yaml_file()
 
         # Test wheter cancelled, running or finished
         if info is None:
@@ -747,7 +1312,7 @@ class LocalMachineExecutionHandler(RunExecutionHandler):
             pids = info['pids']
 
             # Check if at least one pid is still running
-            if not any(psutil.pid_exists(int(pid))
+            if not any(process_alive(int(pid))
                        for pid in pids if pid != ''):
                 return "cancelled"
             else:
@@ -784,8 +1349,9 @@ class HTCondorExecutionHandler(RunExecutionHandler):
 
         # Check wheter htcondor is available on system
         with open('.qanat/config.yaml', 'r') as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
-        if not shutil.which('condor_submit'):
+            config = yaml.load(f, Loader=YAMLLoader)
+        bindings_available = load_htcondor()
+        if not shutil.which('condor_submit') or not bindings_available:
             if not config['nohtcondorwarning']:
                 logger.warning("HTCondor not available on system.")
             self.htcondor_available = False
@@ -795,6 +1361,15 @@ class HTCondorExecutionHandler(RunExecutionHandler):
         self.htcondor_submit_options = htcondor_submit_options
         self.wait = wait
 
+        # Position in each job log file and what was read so far
+        self._log_cursors = {}
+
+        # Files signature and status seen at the last status check
+        self._last_poll = None
+
+        # Repertories and log file paths of the jobs, joined once
+        self._log_paths = None
+
     def run_experiment(self):
         """Run the experiment."""
 
@@ -805,76 +1380,81 @@ class HTCondorExecutionHandler(RunExecutionHandler):
         # Getting schedd
         schedd = htcondor.Schedd()
 
-        # Submit all jobs
-        cluster_ids = []
-        submit_dicts = []
+        # Write the executable of each job
         for command, repertory in zip(self.commands,
                                       self.repertories):
 
             str_command = " ".join([str(x) for x in command])
 
-            # Create new executable file
+            # Building the executable, it is written at once
+            lines = ["#!/bin/bash\n",
+                     'echo "Running on host: $HOSTNAME"\n',
+                     'echo "Starting at: $(date)"\n\n',
+                     f'echo "Moving to repertory {self.working_dir}"\n',
+                     f'cd {self.working_dir}\n\n',
+                     'pwd\n',
+                     f'echo "Running command: {str_command}"\n']
+
+            # Add pipe to redirect output and error
+            output_path = os.path.join(repertory, 'stdout.txt')
+            error_path = os.path.join(repertory, 'stderr.txt')
+            str_command += f" > {output_path} 2> {error_path}"
+            lines += [str_command + '\n\n',
+                      'echo "Done."\n']
+
             executable = os.path.join(repertory, 'executable.sh')
             with open(executable, 'w') as f:
-                f.write("#!/bin/bash\n")
-                f.write('echo "Running on host: $HOSTNAME"\n')
-                f.write('echo "Starting at: $(date)"\n\n')
-
-                f.write(f'echo "Moving to repertory {self.working_dir}"\n')
-                f.write(f'cd {self.working_dir}\n\n')
-                f.write('pwd\n')
-
-                f.write(f'echo "Running command: {str_command}"\n')
-
-                # Add pipe to redirect output and error
-                output_path = os.path.join(repertory, 'stdout.txt')
-                error_path = os.path.join(repertory, 'stderr.txt')
-                str_command += f" > {output_path} 2> {error_path}"
-                f.write(str_command + '\n\n')
-                f.write('echo "Done."')
+                f.write("".join(lines))
 
             # Make executable file executable
             os.chmod(executable, 0o755)
-
-            # TODO: Maybe not hardcode some stuff...
-            submit_dict = {
-                'executable': executable,
-                'output': os.path.join(repertory, 'stdout_htcondor.txt'),
-                'error': os.path.join(repertory, 'stderr_htcondor.txt'),
-                'log': os.path.join(repertory, 'log.txt'),
-                'should_transfer_files': 'YES',
-                'when_to_transfer_output': 'ON_EXIT',
-                'batch_name': f"{self.experiment.name}_{self.run_id}"
-            }
-            if self.htcondor_submit_options is not None:
-                submit_dict.update(self.htcondor_submit_options)
-
-            # Submit the job
-            logger.info(f"Submitting job for command {str_command}")
-            job = htcondor.Submit(submit_dict)
-            submit_result = schedd.submit(job)
-            cluster_ids.append(submit_result.cluster())
-            submit_dicts.append(submit_dict)
+            logger.info(f"Writing executable for command {str_command}")
+
+        # All the jobs only differ by their repertory, so they are
+        # submitted at once as the procs of a single cluster
+        # TODO: Maybe not hardcode some stuff...
+        submit_template = {
+            'executable': '$(repertory)/executable.sh',
+            'output': '$(repertory)/stdout_htcondor.txt',
+            'error': '$(repertory)/stderr_htcondor.txt',
+            'log': '$(repertory)/log.txt',
+            'should_transfer_files': 'YES',
+            'when_to_transfer_output': 'ON_EXIT',
+            'batch_name': f"{self.experiment.name}_{self.run_id}"
+        }
+        if self.htcondor_submit_options is not None:
+            submit_template.update(self.htcondor_submit_options)
+
+        logger.info(f"Submitting {len(self.repertories)} jobs")
+        job = htcondor.Submit(submit_template)
+        submit_result = schedd.submit(
+                job, itemdata=iter([{'repertory': repertory}
+                                    for repertory in self.repertories]))
+        cluster_ids = [submit_result.cluster()] * len(self.repertories)
+        proc_ids = [submit_result.first_proc() + i
+                    for i in range(len(self.repertories))]
+        submit_dicts = [
+            {key: value.replace('$(repertory)', repertory)
+             if isinstance(value, str) else value
+             for key, value in submit_template.items()}
+            for repertory in self.repertories]
 
         # Update the database
-        Session = self.session_maker()
-        update_run_status(Session, self.run_id,
-                          'running')
-        Session.commit()
-        Session.close()
+        self.persist_run_state(status='running')
 
         # Update the YAML file
         info = self.parse_yaml_file()
         info['status'] = 'running'
         info['start_time'] = datetime.now()
         info['cluster_ids'] = cluster_ids
+        info['proc_ids'] = proc_ids
         info['submit_dicts'] = submit_dicts
         self.update_yaml_file(info)
 
         self.cluster_ids = cluster_ids
 
         logger.info("Jobs submitted to clusters: ")
-        for cluster_id in cluster_ids:
+        for cluster_id in dict.fromkeys(cluster_ids):
             logger.info(f"  - {cluster_id}")
 
         if self.wait:
@@ -887,10 +1467,14 @@ class HTCondorExecutionHandler(RunExecutionHandler):
         console = rich.console.Console()
         with console.status("Waiting for jobs to finish...",
                             spinner="dots") as status:
+            # Poll less and less often while nothing changes and
+            # come back to the shortest interval on any change
+            interval = WAIT_TIME_INTERVAL_CHECK
             last_status = self.check_status()
+            last_progress = None
             while last_status in ["running", "unknown",
                                   "not_started"]:
-                time.sleep(WAIT_TIME_INTERVAL_CHECK)
+                time.sleep(interval)
                 progress = self.check_progress()
                 if progress is not None:
                     status.update(
@@ -902,147 +1486,280 @@ class HTCondorExecutionHandler(RunExecutionHandler):
                             status=f"Waiting for jobs to finish... Status: "
                                    f"{last_status}.")
 
-                last_status = self.check_status()
+                new_status = self.check_status()
+                if new_status == last_status and progress == last_progress:
+                    interval = min(interval * WAIT_TIME_INTERVAL_BACKOFF,
+                                   WAIT_TIME_INTERVAL_MAX)
+                else:
+                    interval = WAIT_TIME_INTERVAL_CHECK
+                last_status = new_status
+                last_progress = progress
             status.update(status="Jobs finished")
 
         logger.info(f"Jobs finished with status {self.check_status()}")
 
+    def job_log_paths(self, repertories: list) -> list:
+        """Get the log file path of each job, computed once per run.
+
+        :param repertories: repertories of the jobs of the run
+        :type repertories: list
+
+        :return: the path of the log file of each job
+        :rtype: list
+        """
+        # The repertories of a run never change and a handler is about
+        # a single run
+        if self._log_paths is None:
+            self._log_paths = [os.path.join(repertory, 'log.txt')
+                               for repertory in repertories]
+        return self._log_paths
+
+    def poll_signature(self, repertories: list) -> tuple:
+        """Get modification times and sizes of info.yaml and job logs.
+
+        :param repertories: repertories of the jobs of the run
+        :type repertories: list
+
+        :return: one (mtime, size) per file, None for missing files
+        :rtype: tuple
+        """
+        paths = [self.info_path] + self.job_log_paths(repertories)
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def remember_poll(self, repertories: list, global_status: str):
+        """Keep the files signature and the status of this check.
+
+        :param repertories: repertories of the jobs of the run
+        :type repertories: list
+
+        :param global_status: status of the run
+        :type global_status: str
+        """
+        self._last_poll = {
+            'repertories': repertories,
+            'signature': self.poll_signature(repertories),
+            'global_status': global_status
+        }
+
     def check_status(self):
         """Check the status of the run."""
 
+        # Nothing to do if neither info.yaml nor any job log changed
+        # since the last check
+        if self._last_poll is not None and \
+                self.poll_signature(self._last_poll['repertories']) == \
+                self._last_poll['signature']:
+            return self._last_poll['global_status']
+
         # Read info from YAML file
         info = self.parse_yaml_file()
 
         # Read info from database
-        Session = self.session_maker()
-        run = Session.query(
-                RunOfAnExperiment).filter(
-                        RunOfAnExperiment.id == self.run_id).first()
-        Session.close()
+        with self.session_maker() as Session:
+            run = Session.get(RunOfAnExperiment, self.run_id)
 
         if run is None:
             return "unknown"
-        elif run.status == 'finished' and run.finished is not None:
+        self.persisted_state = {'status': run.status,
+                                'launched': run.launched,
+                                'finished': run.finished}
+        if run.status == 'finished' and run.finished is not None:
             if info is not None and info['status'] != 'finished':
                 info['status'] = 'finished'
                 info['finish_time'] = run.finished
                 self.update_yaml_file(info)
+            if info is not None:
+                self.remember_poll(info['repertories'], "finished")
             return "finished"
 
         if info is None:
             return "unknown"
-        elif info['status'] == 'finished':
-            return "finished"
-        elif info['status'] == 'cancelled':
-            return "cancelled"
+        elif info['status'] in ['finished', 'cancelled']:
+            self.remember_poll(info['repertories'], info['status'])
+            return info['status']
 
         # Check if htcondor is available
         if not self.htcondor_available:
             return "unknown"
 
-        # Get the log files events for
-        # each job
-        status_list = ['unknown' for _ in info['cluster_ids']]
-        launch_times = [None for _ in info['cluster_ids']]
-        finish_times = [None for _ in info['cluster_ids']]
-        for i, repertory in enumerate(info['repertories']):
-
-            log_file = os.path.join(repertory, 'log.txt')
-            if not os.path.exists(log_file):
+        # Ask the schedd for the state of the jobs and use the log
+        # files for the jobs it does not know about
+        # Runs submitted one cluster per job have no proc_ids
+        jobs = list(zip(info['cluster_ids'],
+                        info.get('proc_ids', [0] * len(info['cluster_ids']))))
+        status_list = ['unknown' for _ in jobs]
+        launch_times = [None for _ in jobs]
+        finish_times = [None for _ in jobs]
+        job_states = self.query_job_states(jobs)
+        log_files = {}
+        for i, log_file in enumerate(
+                self.job_log_paths(info['repertories'])):
+
+            if jobs[i] in job_states:
+                status_list[i], launch_times[i], finish_times[i] = \
+                    job_states[jobs[i]]
                 continue
-            events = [event for event in JobEventLog(log_file).events(
-                stop_after=0)]
-            last_event = events[-1]
 
-            # Adapt status in function of last event
-            if last_event.type == JobEventType.SUBMIT:
-                status = 'not_started'
-            elif last_event.type == JobEventType.EXECUTE:
-                status = 'running'
-            elif last_event.type == JobEventType.JOB_TERMINATED:
-                status = 'finished'
-            elif last_event.type == JobEventType.JOB_HELD:
-                status = 'held'
-            elif last_event.type == JobEventType.JOB_RELEASED or \
-                    last_event.type == JobEventType.IMAGE_SIZE:
-                status = 'running'
-            elif last_event.type == JobEventType.JOB_ABORTED:
-                status = 'cancelled'
-            else:
-                status = 'unknown'
+            if os.path.exists(log_file):
+                log_files[i] = log_file
 
-            status_list[i] = status
-
-            # Get launch time
-            for event in events:
-                if event.type == JobEventType.EXECUTE:
-                    launch_times[i] = datetime.fromtimestamp(event.timestamp)
-                    break
-
-            # Get the finish time
-            for event in events:
-                if event.type == JobEventType.JOB_TERMINATED or \
-                     event.type == JobEventType.JOB_ABORTED:
-                    finish_times[i] = datetime.fromtimestamp(event.timestamp)
-                    break
+        # Log files are independent, read them concurrently
+        if len(log_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(
+                    LOG_SCAN_MAX_WORKERS, len(log_files))) as executor:
+                log_states = dict(zip(
+                    log_files,
+                    executor.map(self.scan_job_log, log_files.values())))
+        else:
+            log_states = {i: self.scan_job_log(log_file)
+                          for i, log_file in log_files.items()}
+        for i, log_state in log_states.items():
+            status_list[i], launch_times[i], finish_times[i] = log_state
 
         # Update global status according to status of jobs
-        if any([status == 'running' for status in status_list]):
+        status_counts = Counter(status_list)
+        if status_counts['running']:
             global_status = 'running'
-        elif all([status == 'finished' for status in status_list]):
+        elif status_counts['finished'] == len(status_list):
             global_status = 'finished'
-        elif any([status == 'cancelled' for status in status_list]):
+        elif status_counts['cancelled']:
             global_status = 'cancelled'
-        elif any([status == 'held' for status in status_list]):
+        elif status_counts['held']:
             global_status = 'held'
-        elif all([status == 'not_started' for status in status_list]):
+        elif status_counts['not_started'] == len(status_list):
             global_status = 'not_started'
         else:
             global_status = 'unknown'
 
         # Get first launch time
-        launch_times = [launch_time for launch_time in launch_times
-                        if launch_time is not None]
-        if len(launch_times) > 0:
-            launch_time = min(launch_times)
-        else:
-            launch_time = None
+        launch_time = min(filter(None, launch_times), default=None)
 
         # Get last finish time if all jobs are finished
         if global_status == 'finished':
-            finish_times = [finish_time for finish_time in finish_times
-                            if finish_time is not None]
-            finish_time = max(finish_times)
+            finish_time = max(filter(None, finish_times), default=None)
         else:
             finish_time = None
 
         # Update the database
-        Session = self.session_maker()
-        update_run_status(Session, self.run_id,
-                          global_status)
-        if launch_time is not None:
-            update_run_start_time(Session, self.run_id,
-                                  launch_time)
-        if finish_time is not None:
-            update_run_finish_time(Session, self.run_id,
-                                   finish_time)
-        Session.commit()
-        Session.close()
+        self.persist_run_state(global_status, launch_time, finish_time)
 
         # Update the YAML file
-        # Locking in case other processes want to check the status at
-        # the same time
         info['status'] = global_status
+        self.update_yaml_file(info)
+        self.remember_poll(info['repertories'], global_status)
+
+        return global_status
+
+    def query_job_states(self, jobs: list) -> dict:
+        """Query the schedd for the state of jobs.
+        Jobs still in the queue are fetched with a single xquery, the
+        other ones with a single history query.
+
+        :param jobs: The (cluster id, proc id) of the jobs.
+        :type jobs: list
+
+        :return: For each (cluster id, proc id) found, its status,
+                 launch time and finish time.
+        :rtype: dict
+        """
+        projection = ['ClusterId', 'ProcId', 'JobStatus', 'JobStartDate',
+                      'CompletionDate', 'EnteredCurrentStatus']
+        cluster_ids = set(cluster_id for cluster_id, _ in jobs)
+        constraint = "member(ClusterId, {%s})" % ",".join(
+                str(cluster_id) for cluster_id in cluster_ids)
 
-        lock = FileLock(
-                os.path.join(self.run.storage_path, 'info.yaml.lock'))
-        lock.acquire()
+        job_states = {}
         try:
-            self.update_yaml_file(info)
-        finally:
-            lock.release()
+            schedd = htcondor.Schedd()
+            ads = list(schedd.xquery(constraint, projection))
+            missing = set(jobs).difference(
+                    (ad['ClusterId'], ad.get('ProcId', 0)) for ad in ads)
+            if len(missing) > 0:
+                # Stop searching the history once older clusters
+                # are reached
+                missing_clusters = set(
+                        cluster_id for cluster_id, _ in missing)
+                ads += list(schedd.history(
+                    "member(ClusterId, {%s})" % ",".join(
+                        str(cluster_id) for cluster_id in missing_clusters),
+                    projection, match=len(missing),
+                    since=f"ClusterId < {min(missing_clusters)}"))
+        except (htcondor.HTCondorLocateError,
+                htcondor.HTCondorIOError) as e:
+            logger.debug(f"Could not query the schedd: {e}")
+            return job_states
+
+        for ad in ads:
+            status = HTCONDOR_JOB_STATUS.get(ad.get('JobStatus'), 'unknown')
 
-        return global_status
+            launch_time = None
+            if ad.get('JobStartDate') is not None:
+                launch_time = datetime.fromtimestamp(ad['JobStartDate'])
+
+            finish_time = None
+            if status in ['finished', 'cancelled']:
+                if ad.get('CompletionDate', 0) > 0:
+                    finish_time = datetime.fromtimestamp(
+                            ad['CompletionDate'])
+                elif ad.get('EnteredCurrentStatus') is not None:
+                    finish_time = datetime.fromtimestamp(
+                            ad['EnteredCurrentStatus'])
+
+            job_states[(ad['ClusterId'], ad.get('ProcId', 0))] = \
+                (status, launch_time, finish_time)
+
+        return job_states
+
+    def scan_job_log(self, log_file: str) -> tuple:
+        """Read the events of a job log file.
+
+        The JobEventLog of each file is kept between calls so that
+        only the events written since the previous call are read.
+
+        :param log_file: The path to the log file of the job.
+        :type log_file: str
+
+        :return: The status, launch time and finish time of the job.
+        :rtype: tuple
+        """
+        cursor = self._log_cursors.get(log_file)
+        if cursor is None:
+            cursor = {'log': htcondor.JobEventLog(log_file), 'size': -1,
+                      'status': 'unknown', 'launch': None, 'finish': None}
+            self._log_cursors[log_file] = cursor
+
+        # Nothing was written since the previous call
+        size = os.stat(log_file).st_size
+        if size == cursor['size']:
+            return cursor['status'], cursor['launch'], cursor['finish']
+        cursor['size'] = size
+
+        for event in cursor['log'].events(stop_after=0):
+
+            # Adapt status in function of last event
+            event_type = event.type
+            status = HTCONDOR_EVENT_STATUS.get(event_type, 'unknown')
+            cursor['status'] = status
+
+            # Get launch time
+            if cursor['launch'] is None and \
+                    event_type == htcondor.JobEventType.EXECUTE:
+                cursor['launch'] = datetime.fromtimestamp(event.timestamp)
+
+            # Get the finish time
+            if cursor['finish'] is None and \
+                    status in ('finished', 'cancelled'):
+                cursor['finish'] = datetime.fromtimestamp(event.timestamp)
+
+        return cursor['status'], cursor['launch'], cursor['finish']
 
     def cancel_experiment(self):
         """Cancel a run of the experiment."""
@@ -1059,13 +1776,12 @@ class HTCondorExecutionHandler(RunExecutionHandler):
 
         # Removing jobs that are removable
         schedd = htcondor.Schedd()
-        for cluster_id in info['cluster_ids']:
-            query = schedd.query(f'ClusterId == {cluster_id}')
-            if len(query) >= 1:
-                if query[0]['JobStatus'] in [1, 2, 5]:
-                    schedd.act(
-                        htcondor.JobAction.Remove,
-                        f"ClusterId == {cluster_id}")
+        constraint = "member(ClusterId, {%s})" % ",".join(
+                str(cluster_id)
+                for cluster_id in dict.fromkeys(info['cluster_ids']))
+        query = schedd.query(constraint, ['ClusterId', 'JobStatus'])
+        if any(ad['JobStatus'] in [1, 2, 5] for ad in query):
+            schedd.act(htcondor.JobAction.Remove, constraint)
 
         # Updating YAML file
         info["status"] = "cancelled"
@@ -1073,12 +1789,8 @@ class HTCondorExecutionHandler(RunExecutionHandler):
         self.update_yaml_file(info)
 
         # Update database
-        Session = self.session_maker()
-        update_run_status(Session, self.run_id,
-                          'cancelled')
-        update_run_finish_time(Session, self.run_id,
-                               datetime.now())
-        Session.close()
+        self.persist_run_state(status='cancelled',
+                               finish_time=info["finish_time"])
 
 
 class SlurmExecutionHandler(RunExecutionHandler):
@@ -1108,34 +1820,34 @@ class SlurmExecutionHandler(RunExecutionHandler):
             logger.error("Slurm is not available on this machine")
             sys.exit(-1)
 
-        # Creating the executed script in run storage_path
+        # Building the executed script in run storage_path, it is
+        # written at once at the end
         script_path = os.path.join(self.run.storage_path,
                                    'slurm_script.sh')
-        with open(script_path, 'w') as f:
-            f.write('#!/bin/bash\n')
-            f.write("# Slurm execution script for Qanat run"
-                    f" {self.run_id}\n\n")
-
-            # Slurm options
-            if self.slurm_options is not None:
-                for option, value in self.slurm_options.items():
-                    # If -- or -
-                    if option.startswith('-') and not option.startswith('--'):
-                        f.write(f"#SBATCH {option} {value}\n")
-                    else:
-                        f.write(f"#SBATCH {option}={value}\n")
+        lines = ['#!/bin/bash\n',
+                 "# Slurm execution script for Qanat run"
+                 f" {self.run_id}\n\n"]
+
+        # Slurm options
+        if self.slurm_options is not None:
+            for option, value in self.slurm_options.items():
+                # If -- or -
+                if option.startswith('-') and not option.startswith('--'):
+                    lines.append(f"#SBATCH {option} {value}\n")
+                else:
+                    lines.append(f"#SBATCH {option}={value}\n")
 
-            # Add job name
-            f.write(f"#SBATCH --job-name=qanat_{self.run_id}\n")
+        # Add job name
+        lines.append(f"#SBATCH --job-name=qanat_{self.run_id}\n")
 
-            # Add output and error files
-            f.write(
-                "#SBATCH --output="
-                f"{os.path.join(self.run.storage_path, '%x.%j.stdout.txt')}\n")
-            f.write(
-                "#SBATCH --error="
-                f"{os.path.join(self.run.storage_path, '%x.%j.stderr.txt')}\n"
-                "\n")
+        # Add output and error files
+        lines.append(
+            "#SBATCH --output="
+            f"{os.path.join(self.run.storage_path, '%x.%j.stdout.txt')}\n")
+        lines.append(
+            "#SBATCH --error="
+            f"{os.path.join(self.run.storage_path, '%x.%j.stderr.txt')}\n"
+            "\n")
 
         # Separating a regular job from an array job
         if len(self.commands) > 1:
@@ -1147,51 +1859,57 @@ class SlurmExecutionHandler(RunExecutionHandler):
             # SLURM_ARRAY_TASK_ID
             commands_config_path = os.path.join(
                     self.run.storage_path, 'slurm_commands_config.txt')
+            config_lines = [f"Commands file for run {self.run_id}\n",
+                            f"Number of commands: {len(self.commands)}\n\n",
+                            "-" * 80 + "\n",
+                            "ArrayTaskId\tCommand\n"]
+            for i, command in enumerate(self.commands):
+                str_command = " ".join([str(x) for x in command])
+                config_lines.append(f"{i+1}\t{str_command}\n")
+            config_lines.append("-" * 80)
             with open(commands_config_path, 'w') as f:
-                f.write(f"Commands file for run {self.run_id}\n")
-                f.write(f"Number of commands: {len(self.commands)}\n\n")
-                f.write("-" * 80 + "\n")
-                f.write("ArrayTaskId\tCommand\n")
-                for i, command in enumerate(self.commands):
-                    str_command = " ".join([str(x) for x in command])
-                    f.write(f"{i+1}\t{str_command}\n")
-                f.write("-" * 80)
+                f.write("".join(config_lines))
 
-            with open(script_path, 'a') as f:
-                # Adding the array option to slurm script
-                f.write(f"#SBATCH --array=1-{len(self.commands)}\n\n")
+            # One file per task holding its command so that each
+            # task reads its command directly
+            commands_dir = os.path.join(self.run.storage_path, 'commands')
+            os.makedirs(commands_dir, exist_ok=True)
+            for i, command in enumerate(self.commands):
+                with open(os.path.join(commands_dir,
+                                       f'task_{i+1}.sh'), 'w') as f:
+                    f.write(" ".join([str(x) for x in command]) + "\n")
 
-                # Parsing the commands file for the right command
-                # to execute from the SLURM_ARRAY_TASK_ID
-                f.write(
-                    f'COMMAND=$(awk -v ARRAY_TASK_ID=$SLURM_ARRAY_TASK_ID '
-                    f'\'$1==ARRAY_TASK_ID {{print substr($0,index($0,$2))}}\' '
-                    f'{commands_config_path})\n')
+            # Adding the array option to slurm script
+            lines.append(f"#SBATCH --array=1-{len(self.commands)}\n\n")
+
+            # Reading the command to execute from the
+            # SLURM_ARRAY_TASK_ID
+            lines.append(
+                f'COMMAND=$(< {commands_dir}/'
+                'task_${SLURM_ARRAY_TASK_ID}.sh)\n')
 
         # Case: only one command
         else:
 
             logger.info(f"Submitting a single job with command "
                         f"{self.commands[0]}")
-            with open(script_path, 'a') as f:
-                str_command = " ".join([str(x) for x in self.commands[0]])
-                f.write(f'COMMAND="{str_command}"\n')
+            str_command = " ".join([str(x) for x in self.commands[0]])
+            lines.append(f'COMMAND="{str_command}"\n')
 
-        # Finishing the slurm script
-        with open(script_path, 'a') as f:
+        # Some info and moving to the working directory
+        lines += ['echo "Running on host: $HOSTNAME"\n',
+                  'echo "Starting at: $(date)"\n\n',
+                  f'echo "Moving to repertory {self.working_dir}"\n',
+                  f'cd {self.working_dir}\n\n',
+                  'pwd\n']
 
-            # Some info and moving to the working directory
-            f.write('echo "Running on host: $HOSTNAME"\n')
-            f.write('echo "Starting at: $(date)"\n\n')
+        # Executing the command
+        lines += ['echo "Executing command: $COMMAND"\n',
+                  'eval "$COMMAND"\n\n',
+                  'echo "Finished at: $(date)"\n']
 
-            f.write(f'echo "Moving to repertory {self.working_dir}"\n')
-            f.write(f'cd {self.working_dir}\n\n')
-            f.write('pwd\n')
-
-            # Executing the command
-            f.write('echo "Executing command: $COMMAND"\n')
-            f.write('eval "$COMMAND"\n\n')
-            f.write('echo "Finished at: $(date)"\n')
+        with open(script_path, 'w') as f:
+            f.write("".join(lines))
 
         # Submitting the job
         logger.info(f"Submitting job for run {self.run_id}")
@@ -1200,13 +1918,22 @@ class SlurmExecutionHandler(RunExecutionHandler):
         logger.info(f"Slurm options: {self.slurm_options}")
         logger.info(f"Commands: {self.commands}")
 
-        # Submitting the job
-        submit = ['sbatch', script_path]
-        if self.wait:
-            submit.append('--wait')
+        # Submitting the job, through sbatch when waiting since the
+        # bindings have no equivalent to --wait
         try:
-            output = subprocess.check_output(submit)
-        except subprocess.CalledProcessError as e:
+            if not self.wait and load_pyslurm():
+                description = pyslurm.JobSubmitDescription(
+                        script=script_path)
+                description.load_sbatch_options()
+                job_id = str(description.submit())
+            else:
+                submit = ['sbatch', script_path]
+                if self.wait:
+                    submit.append('--wait')
+                output = subprocess.check_output(submit)
+                job_id = output.decode('utf-8').split()[-1]
+        except (subprocess.CalledProcessError,
+                getattr(pyslurm, 'RPCError', ())) as e:
             logger.error("Error while submitting the job")
             logger.error(e)
             info = self.parse_yaml_file()
@@ -1215,7 +1942,6 @@ class SlurmExecutionHandler(RunExecutionHandler):
             sys.exit(-1)
 
         # Getting the job id
-        job_id = output.decode('utf-8').split()[-1]
         logger.info(f"Job submitted with id {job_id}")
 
         # Updating the YAML file
@@ -1225,6 +1951,19 @@ class SlurmExecutionHandler(RunExecutionHandler):
         info['start_time'] = datetime.now()
         self.update_yaml_file(info)
 
+    def get_pending_job_id(self) -> str:
+        """Get the Slurm job id of the run if its status still
+        needs to be queried.
+
+        :return: The job id or None if the run is over or was not
+                 submitted.
+        :rtype: str
+        """
+        info = self.parse_yaml_file()
+        if info is None or info.get('status') in ['finished', 'cancelled']:
+            return None
+        return info.get('job_id')
+
     def check_status(self):
 
         # Read info from YAML file
@@ -1242,79 +1981,50 @@ class SlurmExecutionHandler(RunExecutionHandler):
         # Getting the job id
         job_id = info['job_id']
 
-        # Checking the job status with sacct -j <job_id>
+        # Checking the job status with sacct
         try:
-            output = subprocess.check_output(
-                    ['sacct', '-j', job_id,
-                     '--format=JobIDRaw,Start,State,Elapsed'])
-            output = output.decode('utf-8')
-
-            # Getting the status by parsing the output lines
-            status = []
-            start_times = []
-            elapsed_times = []
-            for line in output.split('\n')[2:]:
-                if line.startswith(job_id) and not line.startswith(f'{job_id}.'):
-                    status.append(line.split()[2])
-                    start_times.append(line.split()[1])
-                    elapsed_times.append(line.split()[3])
+            tasks = sacct_batcher.get_states([job_id])[job_id]
+            status = [state for state, _, _ in tasks]
+            start_times = [start for _, start, _ in tasks]
+            elapsed_times = [elapsed for _, _, elapsed in tasks]
 
             # Getting the global status
             if len(status) == 0:
                 global_status = 'unknown'
-            elif any(['CANCELLED' in x for x in status]):
+            elif any('CANCELLED' in x for x in status):
                 global_status = 'cancelled'
-            elif any(['FAILED' in x for x in status]):
+            elif any('FAILED' in x for x in status):
                 global_status = 'cancelled'
-            elif any(['TIMEOUT' in x for x in status]):
+            elif any('TIMEOUT' in x for x in status):
                 global_status = 'cancelled'
-            elif all(['COMPLETED' in x for x in status]):
+            elif all('COMPLETED' in x for x in status):
                 global_status = 'finished'
-            elif any(['RUNNING' in x for x in status]):
+            elif any('RUNNING' in x for x in status):
                 global_status = 'running'
             else:
                 global_status = 'unknown'
 
-            # Update the database
-            Session = self.session_maker()
-            update_run_status(Session, self.run_id,
-                              global_status)
-            Session.commit()
-            Session.close()
-
             # Getting the start time if not set
-            if self.run.launched is None:
-                start_time = min([datetime.strptime(x, '%Y-%m-%dT%H:%M:%S')
-                                  for x in start_times])
-
-                info['start_time'] = start_time
-
-                # Update database if the start time isn't already set
-                Session = self.session_maker()
-
-                # Getting the start time from the database
-                run = Session.query(RunOfAnExperiment).filter(
-                    RunOfAnExperiment.id == self.run_id).first()
-
-                if run.launched is None:
-                    update_run_start_time(Session, self.run_id,
-                                          start_time)
-                Session.close()
+            start_time = None
+            if self.persisted_state['launched'] is None:
+                start_time = min(filter(None, map(parse_slurm_datetime,
+                                                  start_times)),
+                                 default=None)
+                if start_time is not None:
+                    info['start_time'] = start_time
 
             # Getting the elapsed time if the job is finished or cancelled
-            if self.run.finished is None and \
-               global_status == 'finished' or global_status == 'cancelled':
-                elapsed_time = max([datetime.strptime(x, '%H:%M:%S')
-                                    for x in elapsed_times])
-                time_delta = timedelta(hours=elapsed_time.hour,
-                                       minutes=elapsed_time.minute,
-                                       seconds=elapsed_time.second)
-
-                info['finish_time'] = info['start_time'] + time_delta
-                Session = self.session_maker()
-                update_run_finish_time(Session, self.run_id,
-                                       info['start_time'] + time_delta)
-                Session.close()
+            finish_time = None
+            if self.persisted_state['finished'] is None and \
+               global_status in ['finished', 'cancelled']:
+                time_delta = max(filter(None, map(parse_slurm_elapsed,
+                                                  elapsed_times)),
+                                 default=timedelta())
+                finish_time = info['start_time'] + time_delta
+                info['finish_time'] = finish_time
+
+            # Update the database
+            self.persist_run_state(global_status, start_time, finish_time)
 
         except subprocess.CalledProcessError as e:
             logger.error("Error while checking the job status"
@@ -1338,13 +2048,23 @@ class SlurmExecutionHandler(RunExecutionHandler):
         # Getting the job id
         job_id = info['job_id']
 
-        # Cancelling the job with scancel
+        # Cancelling the job
         try:
-            subprocess.run(['scancel', job_id])
-        except subprocess.CalledProcessError as e:
+            if load_pyslurm():
+                pyslurm.Job(int(job_id)).cancel()
+            else:
+                subprocess.run(['scancel', job_id])
+        except (subprocess.CalledProcessError,
+                getattr(pyslurm, 'RPCError', ())) as e:
             logger.error("Error while cancelling the job")
             logger.error(e)
 
         # Updating the YAML file
         info['status'] = 'cancelled'
         self.update_yaml_file(info)
+
+
+# Execution handler of each runner, new runners register here
+EXECUTION_HANDLERS = {'local': LocalMachineExecutionHandler,
+                      'htcondor': HTCondorExecutionHandler,
+                      'slurm': SlurmExecutionHandler}
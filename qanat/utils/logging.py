@@ -12,6 +12,7 @@ from rich.logging import RichHandler
 import sqlite3
 import os
 import yaml
+from .misc import YAMLLoader
 
 DEFAULT_LOGGING_LEVEL = logging.DEBUG
 
@@ -46,9 +47,14 @@ def setup_logger(path='.qanat'):
     :return: The logger.
     """
 
+    # Already set up: basicConfig would do nothing, no need to read the
+    # config or build a handler again
+    if logging.getLogger().handlers:
+        return logging.getLogger("rich")
+
     try:
         with open(os.path.join(path, 'config.yaml'), 'r') as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
+            config = yaml.load(f, Loader=YAMLLoader)
             LOGGING_LEVEL = parse_logging_level(config['logging'])
     except (FileNotFoundError, KeyError, ValueError):
         LOGGING_LEVEL = DEFAULT_LOGGING_LEVEL
@@ -65,3 +71,20 @@ def setup_logger(path='.qanat'):
     logger = logging.getLogger("rich")
 
     return logger
+
+
+class LazyLogger:
+    """Logger set up on its first use instead of at import time.
+
+    Setting up the logger reads the Qanat configuration and builds the
+    rich handler, which commands that log nothing don't need.
+    """
+
+    def __init__(self, path='.qanat'):
+        self.path = path
+        self.logger = None
+
+    def __getattr__(self, name):
+        if self.logger is None:
+            self.logger = setup_logger(self.path)
+        return getattr(self.logger, name)
@@ -6,6 +6,15 @@ from rich.markup import escape
 from rich.text import Text
 from rich.tree import Tree
 
+# Fastest safe YAML loader and dumper available: the libyaml bindings
+# when PyYAML was built with them, the pure Python ones otherwise
+try:
+    from yaml import (  # noqa: F401
+        CSafeLoader as YAMLLoader, CSafeDumper as YAMLDumper)
+except ImportError:
+    from yaml import (  # noqa: F401
+        SafeLoader as YAMLLoader, SafeDumper as YAMLDumper)
+
 
 def walk_directory(directory: pathlib.Path, tree: Tree) -> None:
     """Recursively build a Tree with directory contents.
@@ -57,13 +66,23 @@ def get_size(start_path='.') -> float:
     :return: The size of the directory.
     :rtype: float
     """
+    # The entries of scandir already know their type, only the size of
+    # regular files needs a stat
     total_size = 0
-    for dirpath, dirnames, filenames in os.walk(start_path):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            # skip if it is symbolic link
-            if not os.path.islink(fp):
-                total_size += os.path.getsize(fp)
+    directories = [start_path]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                # skip if it is symbolic link
+                elif not entry.is_symlink():
+                    total_size += entry.stat(follow_symlinks=False).st_size
 
     return total_size
 
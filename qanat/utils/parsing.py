@@ -5,10 +5,10 @@ import yaml
 import itertools
 import rich_click as click
 from .misc import float_range
-from .logging import setup_logger
+from .logging import LazyLogger
 
 
-logger = setup_logger()
+logger = LazyLogger()
 
 
 def get_values_nested_dict(d: dict) -> list:
@@ -368,23 +368,18 @@ def parse_group_parameters(group_parameters: dict) -> list:
     :param group_parameters: Dictionary of parameters
     :type group_parameters: dict
 
-    :return: List of parameters
+    :return: List of parameters, as strings
     :rtype: list
     """
 
-    list_pos_arguments = []
-    list_options = []
-    for key, value in group_parameters.items():
+    items = group_parameters.items()
 
-        # Positional arguments
-        if not key.startswith('--'):
-            list_pos_arguments.append(value)
-        else:
-            if isinstance(value, list):
-                for v in value:
-                    list_options += [key, v]
-            else:
-                list_options += [key, value]
+    # Positional arguments first, then options which can be repeated
+    list_pos_arguments = [str(value) for key, value in items
+                          if not key.startswith('--')]
+    list_options = [str(x) for key, value in items if key.startswith('--')
+                    for v in (value if isinstance(value, list) else [value])
+                    for x in (key, v)]
 
     return list_pos_arguments + list_options
 
@@ -11,8 +11,8 @@ with open('HISTORY.rst') as history_file:
     history = history_file.read()
 
 requirements = ['rich', 'rich_click', 'SQLAlchemy',
-                'GitPython', 'pyyaml', 'psutil',
-                'simple-term-menu', 'art', 'filelock']
+                'GitPython', 'pyyaml',
+                'simple-term-menu', 'art']
 
 test_requirements = ['pytest>=3', 'flake8>=3.7.8',
                      'coverage>=4.5.4']
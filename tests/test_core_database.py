@@ -9,6 +9,7 @@
 
 from qanat.core import database
 import tempfile
+from datetime import datetime
 import unittest
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm import DeclarativeMeta
@@ -149,6 +150,38 @@ class TestDatabaseAddingStuffDummy(unittest.TestCase):
         self.assertEqual(action.executable_command, "/usr/bin/bash")
         self.assertEqual(action.experiment_id, exp_id)
 
+    def test_update_run_state(self):
+        """Test updating the status and times of a run at once."""
+        database.add_experiment(
+            self.session,
+            path="test path",
+            name="test experiment run",
+            description="this is a test description",
+            executable="test executable.sh",
+            executable_command="/usr/bin/bash",
+        )
+        run = database.add_run(self.session, "test experiment run",
+                               "test storage path", "test commit sha")
+        start_time = datetime(2023, 5, 1, 10, 0, 0)
+        finish_time = datetime(2023, 5, 1, 11, 0, 0)
+
+        database.update_run_state(self.session, run.id,
+                                  new_status="running",
+                                  new_start_time=start_time)
+        run = self.session.get(database.RunOfAnExperiment, run.id)
+        self.assertEqual(run.status, "running")
+        self.assertEqual(run.launched, start_time)
+        self.assertIsNone(run.finished)
+
+        # Values left to None are not modified
+        database.update_run_state(self.session, run.id,
+                                  new_status="finished",
+                                  new_finish_time=finish_time)
+        run = self.session.get(database.RunOfAnExperiment, run.id)
+        self.assertEqual(run.status, "finished")
+        self.assertEqual(run.launched, start_time)
+        self.assertEqual(run.finished, finish_time)
+
 
 class TestDatabaseCreationScenario(unittest.TestCase):
     """Test the creation of a database with the
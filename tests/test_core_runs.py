@@ -0,0 +1,310 @@
+# ========================================
+# FileName: test_core_runs.py
+# Date: 17 octobre 2026 - 11:30
+# Author: Ammar Mian
+# Email: ammar.mian@univ-smb.fr
+# GitHub: https://github.com/ammarmian
+# Brief: Test runs handling of the core module
+# =========================================
+
+from qanat.core import runs
+import os
+import select
+import subprocess
+import tempfile
+import types
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+
+def make_local_handler(storage_path: str) -> runs.LocalMachineExecutionHandler:
+    """Return a local execution handler reading the run files in
+    storage_path, without any database.
+
+    :param storage_path: The storage path of the run.
+    :type storage_path: str
+
+    :return: The execution handler.
+    :rtype: LocalMachineExecutionHandler
+    """
+    handler = runs.LocalMachineExecutionHandler.__new__(
+            runs.LocalMachineExecutionHandler)
+    handler.run = types.SimpleNamespace(id=1, storage_path=storage_path)
+    handler.info_path = os.path.join(storage_path, 'info.yaml')
+    handler.status_log_fd = None
+    return handler
+
+
+class TestLocalStatusLog(unittest.TestCase):
+    """Test the status log folded in the info file of local runs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.handler = make_local_handler(self.tmp.name)
+        self.log_path = os.path.join(self.tmp.name, runs.STATUS_LOG_FILE)
+        self.handler.update_yaml_file({'name': 'test run'})
+
+    def tearDown(self):
+        if self.handler.status_log_fd is not None:
+            os.close(self.handler.status_log_fd)
+        self.tmp.cleanup()
+
+    def test_fold_events(self):
+        """Test rebuilding the lists of the commands from the events."""
+        start = datetime(2023, 5, 4, 13, 0, 0)
+        end = datetime(2023, 5, 4, 14, 0, 0)
+        self.handler.log_status_event(start_time=start)
+        self.handler.log_status_event(0, status='running', pids='10',
+                                      pgids='10', start_time=start)
+        self.handler.log_status_event(2, status='running', pids='12',
+                                      pgids='12')
+        self.handler.log_status_event(0, status='finished', end_time=end)
+        self.handler.log_status_event(end_time=end)
+
+        info = self.handler.parse_yaml_file()
+        self.assertEqual(info['name'], 'test run')
+        self.assertEqual(info['status'], ['finished', '', 'running'])
+        self.assertEqual(info['pids'], ['10', '', '12'])
+        self.assertEqual(info['pgids'], ['10', '', '12'])
+        self.assertEqual(info['end_time'], end)
+        self.assertEqual(info['status_log_offset'],
+                         os.path.getsize(self.log_path))
+
+    def test_fold_times(self):
+        """Test the times of the commands and of the run."""
+        start = datetime(2023, 5, 4, 13, 0, 0)
+        end = datetime(2023, 5, 4, 14, 0, 0)
+        self.handler.log_status_event(1, start_time=start)
+        self.handler.log_status_event(1, end_time=end)
+        self.handler.log_status_event(start_time=start)
+
+        info = self.handler.parse_yaml_file()
+        self.assertEqual(info['start_time'], start)
+        self.assertEqual(info['end_time'], ['', end])
+
+    def test_partial_line_ignored(self):
+        """Test that a line still being written is not parsed."""
+        self.handler.log_status_event(0, status='running')
+        with open(self.log_path, 'a') as f:
+            f.write('{"i": 1, "status": "runn')
+
+        info = self.handler.parse_yaml_file()
+        self.assertEqual(info['status'], ['running'])
+        offset = info['status_log_offset']
+        self.assertLess(offset, os.path.getsize(self.log_path))
+
+        # Once the line is complete it is applied
+        with open(self.log_path, 'a') as f:
+            f.write('ing"}\n')
+        info = self.handler.parse_yaml_file()
+        self.assertEqual(info['status'], ['running', 'running'])
+
+    def test_events_applied_once(self):
+        """Test that events before the stored offset are not applied
+        again."""
+        self.handler.log_status_event(0, status='finished')
+        info = self.handler.parse_yaml_file()
+        info['status'] = ['cancelled']
+        self.handler.update_yaml_file(info)
+
+        self.handler.log_status_event(1, status='running')
+        info = self.handler.parse_yaml_file()
+        self.assertEqual(info['status'], ['cancelled', 'running'])
+        self.assertEqual(info['status_log_offset'],
+                         os.path.getsize(self.log_path))
+
+
+class TestLocalThreads(unittest.TestCase):
+    """Test the number of threads of local runs."""
+
+    def test_negative_threads(self):
+        """Test that a negative number of threads is rejected."""
+        with self.assertRaises(ValueError):
+            runs.LocalMachineExecutionHandler(None, 1, n_threads=-3)
+
+
+class TestRunProcesses(unittest.TestCase):
+    """Test running subprocesses with a limited number alive."""
+
+    def run_all(self, return_codes: list, max_running: int) -> dict:
+        """Run one command per return code and collect them.
+
+        :param return_codes: The return code of each command.
+        :type return_codes: list
+
+        :param max_running: Maximum number of processes alive at once.
+        :type max_running: int
+
+        :return: The return codes found for each index.
+        :rtype: dict
+        """
+        def spawn(index):
+            return subprocess.Popen(
+                    ['sh', '-c', f'exit {return_codes[index]}'])
+
+        found = {}
+        for i, process in runs.run_processes(spawn, len(return_codes),
+                                             max_running):
+            self.assertNotIn(i, found)
+            found[i] = process.returncode
+        return found
+
+    def test_run_processes(self):
+        """Test that every process comes back once with its code."""
+        return_codes = [0, 1, 2, 0, 3, 0, 4]
+        found = self.run_all(return_codes, 3)
+        self.assertEqual(found, dict(enumerate(return_codes)))
+
+    def test_run_processes_threads(self):
+        """Test the fallback waiting for each process in a thread."""
+        removed = {}
+        for module, name in [(os, 'pidfd_open'), (select, 'kqueue')]:
+            if hasattr(module, name):
+                removed[(module, name)] = getattr(module, name)
+                delattr(module, name)
+        try:
+            return_codes = [2, 0, 1, 0, 5]
+            found = self.run_all(return_codes, 2)
+        finally:
+            for (module, name), value in removed.items():
+                setattr(module, name, value)
+        self.assertEqual(found, dict(enumerate(return_codes)))
+
+
+class TestSacctBatcher(unittest.TestCase):
+    """Test querying the state of Slurm jobs."""
+
+    def test_load_tasks_sacct(self):
+        """Test parsing the output of a single sacct call."""
+        output = (
+            "123_0|2024-01-31T12:00:00|COMPLETED|1-02:03:04\n"
+            "123_1|2024-01-31T12:00:05|RUNNING|05:00\n"
+            "123_[2-5]|Unknown|PENDING|00:00:00\n"
+            "456|2024-01-30T08:00:00|CANCELLED by 1000|10:00:00\n"
+            "789|2024-01-30T08:00:00|COMPLETED|00:01:00\n"
+            "malformed line\n").encode('utf-8')
+
+        with patch('qanat.core.runs.subprocess.check_output',
+                   return_value=output) as check_output:
+            tasks = runs.SacctBatcher().load_tasks_sacct(['123', '456'])
+
+        self.assertEqual(check_output.call_count, 1)
+        command = check_output.call_args[0][0]
+        self.assertIn('-X', command)
+        self.assertIn('-P', command)
+        self.assertEqual(command[command.index('-j') + 1], '123,456')
+        self.assertEqual(tasks, {
+            '123': [('COMPLETED', '2024-01-31T12:00:00', '1-02:03:04'),
+                    ('RUNNING', '2024-01-31T12:00:05', '05:00'),
+                    ('PENDING', 'Unknown', '00:00:00')],
+            '456': [('CANCELLED by 1000', '2024-01-30T08:00:00',
+                     '10:00:00')]})
+
+    def test_get_states_cached(self):
+        """Test that states are fetched once within the cache time."""
+        output = b"123|2024-01-31T12:00:00|RUNNING|00:10\n"
+        batcher = runs.SacctBatcher(ttl=60)
+        with patch.object(runs, 'load_pyslurm', return_value=False), \
+                patch('qanat.core.runs.subprocess.check_output',
+                      return_value=output) as check_output:
+            batcher.get_states(['123'])
+            states = batcher.get_states(['123'])
+
+        self.assertEqual(check_output.call_count, 1)
+        self.assertEqual(states, {
+            '123': [('RUNNING', '2024-01-31T12:00:00', '00:10')]})
+
+
+class TestSlurmParsing(unittest.TestCase):
+    """Test parsing the dates and times printed by sacct."""
+
+    def test_parse_slurm_datetime(self):
+        """Test parsing start dates, known or not."""
+        self.assertEqual(runs.parse_slurm_datetime('2024-01-31T12:00:05'),
+                         datetime(2024, 1, 31, 12, 0, 5))
+        self.assertIsNone(runs.parse_slurm_datetime('Unknown'))
+        self.assertIsNone(runs.parse_slurm_datetime('None'))
+
+    def test_parse_slurm_elapsed(self):
+        """Test parsing elapsed times in every sacct format."""
+        self.assertEqual(runs.parse_slurm_elapsed('05:07'),
+                         timedelta(minutes=5, seconds=7))
+        self.assertEqual(runs.parse_slurm_elapsed('10:00:01'),
+                         timedelta(hours=10, seconds=1))
+        self.assertEqual(runs.parse_slurm_elapsed('1-02:03:04'),
+                         timedelta(days=1, hours=2, minutes=3, seconds=4))
+        self.assertEqual(runs.parse_slurm_elapsed('12-00:00:00'),
+                         timedelta(days=12))
+        self.assertEqual(runs.parse_slurm_elapsed('00:00:00'), timedelta())
+
+    def test_parse_slurm_elapsed_invalid(self):
+        """Test that elapsed times sacct could not compute give None."""
+        for value in ['INVALID', 'Unknown', '', '1:2:3:4', 'a-01:00:00']:
+            self.assertIsNone(runs.parse_slurm_elapsed(value))
+
+
+class TestPyslurm(unittest.TestCase):
+    """Test the Slurm python bindings paths with mocked bindings."""
+
+    def setUp(self):
+        self.pyslurm = MagicMock()
+        self.pyslurm.RPCError = type('RPCError', (Exception,), {})
+        patcher = patch.object(runs, 'pyslurm', self.pyslurm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_tasks_pyslurm(self):
+        """Test formatting the jobs as sacct would print them."""
+        start = datetime(2024, 1, 31, 12, 0, 0)
+        self.pyslurm.db.Jobs.load.return_value = {
+            124: types.SimpleNamespace(
+                id=124, array_id=123, state='COMPLETED',
+                start_time=int(start.timestamp()),
+                elapsed_time=93784),
+            125: types.SimpleNamespace(
+                id=125, array_id=123, state='PENDING',
+                start_time=0, elapsed_time=None),
+            456: types.SimpleNamespace(
+                id=456, array_id=None, state='RUNNING',
+                start_time=int(start.timestamp()), elapsed_time=3725),
+            789: types.SimpleNamespace(
+                id=789, array_id=None, state='COMPLETED',
+                start_time=0, elapsed_time=0)}
+
+        tasks = runs.SacctBatcher().load_tasks_pyslurm(['123', '456'])
+
+        self.pyslurm.db.JobFilter.assert_called_once_with(ids=[123, 456])
+        self.assertEqual(tasks, {
+            '123': [('COMPLETED', '2024-01-31T12:00:00', '1-02:03:04'),
+                    ('PENDING', 'Unknown', '00:00:00')],
+            '456': [('RUNNING', '2024-01-31T12:00:00', '01:02:05')]})
+
+        # Formatted values are read back as the sacct ones
+        self.assertEqual(runs.parse_slurm_elapsed(tasks['123'][0][2]),
+                         timedelta(seconds=93784))
+
+    def test_load_tasks_pyslurm_error(self):
+        """Test that slurmdbd errors are raised as sacct errors."""
+        self.pyslurm.db.Jobs.load.side_effect = self.pyslurm.RPCError()
+        with self.assertRaises(subprocess.CalledProcessError):
+            runs.SacctBatcher().load_tasks_pyslurm(['123'])
+
+    def test_cancel_experiment(self):
+        """Test cancelling a Slurm run through the bindings."""
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = runs.SlurmExecutionHandler.__new__(
+                    runs.SlurmExecutionHandler)
+            handler.run = types.SimpleNamespace(id=1, storage_path=tmp)
+            handler.info_path = os.path.join(tmp, 'info.yaml')
+            handler.update_yaml_file({'status': 'running', 'job_id': '123'})
+
+            with patch.object(runs, 'load_pyslurm', return_value=True), \
+                    patch('qanat.core.runs.subprocess.run') as run:
+                handler.cancel_experiment()
+
+            self.pyslurm.Job.assert_called_once_with(123)
+            self.pyslurm.Job.return_value.cancel.assert_called_once_with()
+            run.assert_not_called()
+            self.assertEqual(handler.parse_yaml_file()['status'],
+                             'cancelled')